@@ -33,7 +33,7 @@ License:
     SOFTWARE.
 """
 
-from .strategy import StrategyClassReal
+from .strategy import StrategyClassReal, incremental
 from ._commons import (
     __recvWindow,
     __rec_limit,
@@ -48,7 +48,10 @@ from .main import (
     print_log,
     )
 
+from .session import Session, run_sessions
+from .paper import PaperClient, run_paper
 from . import tradetools as tools
+from . import asynctools as atools
 
 __doc__ = """
 BackPy-binance-connector documentation.
@@ -69,11 +72,17 @@ Important Notice:
 
 __all__ = [
     'StrategyClassReal',
+    'incremental',
     'class_execute',
     'telegram_bot',
     'class_group',
     'print_log',
+    'Session',
+    'run_sessions',
+    'PaperClient',
+    'run_paper',
     'tools',
+    'atools',
     '__recvWindow',
     '__rec_limit',
     '__chat_id',
@@ -6,6 +6,16 @@ This module contains all global variables for better manipulation.
 Hidden Variables:
     __ip_acc: Current public IP of the machine (hidden variable).
     __client: Binance client (hidden variable).
+    __clients: Binance clients created by API key (hidden variable).
+    __adapter: HTTP adapter shared by all the clients (hidden variable).
+    __http: HTTP session of the requests that are not Binance (hidden variable).
+    __pool_size: Number of keep-alive connections of each host (hidden variable).
+    __http_retries: Number of times a request is retried after 
+        a connection error (hidden variable).
+    __timeout: Connect and read timeouts in seconds of the requests (hidden variable).
+    __latency: Latency histograms by endpoint, used 
+        by the 'transport' module (hidden variable).
+    __session: Active trading session (hidden variable).
     __logs: If set to False, simple logs will not be 
         saved or printed (hidden variable).
     __alert: If set to False alerts will not be sent (hidden variable).
@@ -21,6 +31,49 @@ Hidden Variables:
         that it can be changed to a test order (hidden variable).
     __recvWindow: Maximum time in ms that a request to the 
         Binance API can take (hidden variable).
+    __klines_limit: Maximum number of candles of each 
+        Binance API klines request (hidden variable).
+    __max_workers: Maximum number of requests made at the 
+        same time by 'tradetools.run_concurrent' (hidden variable).
+    __async_pool: Thread pool of the 'asynctools' requests (hidden variable).
+    __store_dir: Directory of the local candles store, 
+        if None the store is not used (hidden variable).
+    __symbols: Metadata of each symbol by symbol name (hidden variable).
+    __symbols_time: Time when '__symbols' was loaded (hidden variable).
+    __symbols_ttl: Seconds before '__symbols' is refreshed (hidden variable).
+    __symbols_loading: True while '__symbols' is being 
+        refreshed in the background (hidden variable).
+    __config: Account configuration saved by symbol, each value 
+        with the time it was saved (hidden variable).
+    __config_ttl: Seconds that the values of '__config' are valid (hidden variable).
+    __orders: Open orders table by symbol indexed by 'orderId' 
+        and by 'type' (hidden variable).
+    __snapshot: Balance, open trades and open orders shared by 
+        the strategies of a tick, None if it has to be requested (hidden variable).
+    __ledger: Trade ledger by symbol, used by 
+        'tradetools.closed_trades' (hidden variable).
+    __ledger_ttl: Seconds before the trade ledger is updated 
+        again if it was not invalidated (hidden variable).
+    __rest_calls: Number of requests made to the Binance API (hidden variable).
+    __time_offset: Milliseconds that the Binance server time is ahead 
+        of the machine time (hidden variable).
+    __time_rtt: Round trip time in seconds of the last 
+        clock synchronization (hidden variable).
+    __time_sync: Time of the last clock synchronization (hidden variable).
+    __time_ttl: Seconds before the clock is synchronized again (hidden variable).
+    __time_loading: True while the clock is being synchronized 
+        in the background (hidden variable).
+    __limits: Token buckets of the Binance limits used 
+        by the 'limiter' module (hidden variable).
+    __limit_reserve: Fraction of each limit that is left for the requests 
+        of higher priority, by priority: 0 orders, 1 data, 
+        2 health check (hidden variable).
+    __limit_ban: Time until the requests are banned 
+        by a 429 or 418 response (hidden variable).
+    __limit_wait: Maximum seconds waited for a ban to end, 
+        if it is longer the request fails (hidden variable).
+    __limit_retries: Number of times a request is sent 
+        again after a 429 response (hidden variable).
     __inter_log: Intermediary function for logs, used to send 
         logs to the Telegram bot (hidden variable).
     __instances: Name of the instances of open strategies (hidden variable).
@@ -30,10 +83,26 @@ Hidden Variables:
     __loop: Telegram bot event loop (hidden variable).
     __chat_id: Telegram chat ID to be able to send logs and 
         things automatically. (hidden variable).
+    __stream: Kline WebSocket client, None if the stream 
+        is not running (hidden variable).
+    __stream_latency: Seconds between the last candle close and the 
+        execution of the strategy in stream mode (hidden variable).
+    __user_stream: User data WebSocket client, None if the stream 
+        is not running (hidden variable).
+    __book: Open orders, positions and last fills by symbol kept 
+        by the user data stream, None if it is not used (hidden variable).
 """
 
 __ip_acc = None
 __client = None
+__clients = {}
+__adapter = None
+__http = None
+__pool_size = 20
+__http_retries = 2
+__timeout = (3.05, 10)
+__latency = {}
+__session = None
 
 __logs = True
 __alert = True
@@ -52,6 +121,37 @@ __width = None
 __function = None
 __recvWindow = 6000
 
+__klines_limit = 1000
+__max_workers = 5
+__async_pool = None
+__store_dir = None
+
+__symbols = None
+__symbols_time = None
+__symbols_ttl = 3600
+__symbols_loading = False
+
+__config = {}
+__config_ttl = 3600
+
+__orders = {}
+__snapshot = None
+__ledger = {}
+__ledger_ttl = 60
+__rest_calls = 0
+
+__time_offset = 0
+__time_rtt = None
+__time_sync = None
+__time_ttl = 600
+__time_loading = False
+
+__limits = {}
+__limit_reserve = {0: 0, 1: 0.1, 2: 0.2}
+__limit_ban = 0
+__limit_wait = 60
+__limit_retries = 1
+
 __inter_log = None
 __instances = None
 __main_loop = True
@@ -59,3 +159,8 @@ __main_loop = True
 __bot = None
 __loop = None
 __chat_id = ""
+
+__stream = None
+__stream_latency = None
+__user_stream = None
+__book = None
@@ -0,0 +1,163 @@
+"""
+Async tools module.
+
+This module contains awaitable versions of the 'tradetools' requests,
+    so that independent requests can be made in a single round trip.
+
+Note:
+    The requests are executed in the thread pool '_commons.__async_pool'
+    over the keep-alive connections of the client, the event loop is not blocked.
+
+Functions:
+    to_thread: Execute a function in the thread pool without blocking the event loop.
+    get_balance: Awaitable 'tradetools.get_balance'.
+    get_commission: Awaitable 'tradetools.get_commission'.
+    place_order: Awaitable 'tradetools.place_order'.
+    cancel_order: Awaitable 'tradetools.cancel_order'.
+    open_orders: Awaitable 'tradetools.open_orders'.
+    open_trades: Awaitable 'tradetools.open_trades'.
+    account_state: Request balance, open trades and open orders at the same time.
+    gather: Execute coroutines at the same time from synchronous code.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import pandas as pd
+import asyncio
+
+from . import tradetools as tools
+from . import _commons
+
+async def to_thread(function:callable, *args, **kwargs):
+    """
+    To thread
+
+    Execute 'function' in '_commons.__async_pool' without blocking the event loop.
+
+    Args:
+        function (callable): Function to execute.
+        *args: 'function' arguments.
+        **kwargs: 'function' keyword arguments.
+
+    Returns:
+        Result of 'function'.
+    """
+
+    if _commons.__async_pool is None:
+        _commons.__async_pool = ThreadPoolExecutor(
+            max_workers=_commons.__max_workers, thread_name_prefix='backpyf')
+
+    return await asyncio.get_running_loop().run_in_executor(
+        _commons.__async_pool, partial(function, *args, **kwargs))
+
+async def get_balance() -> float:
+    """
+    Get balance
+
+    Awaitable version of 'tradetools.get_balance'.
+
+    Returns:
+        float: availableBalance.
+    """
+
+    return await to_thread(tools.get_balance)
+
+async def get_commission(symbol:str) -> float:
+    """
+    Get commission
+
+    Awaitable version of 'tradetools.get_commission'.
+
+    Returns:
+        float: takerCommissionRate.
+    """
+
+    return await to_thread(tools.get_commission, symbol)
+
+async def place_order(symbol:str, side:str, quantity:float,
+                      stop_price:float=None, take_profit:float=None) -> tuple:
+    """
+    Place order
+
+    Awaitable version of 'tradetools.place_order'.
+
+    Returns:
+        tuple: order, stop_loss_order, take_profit_order.
+    """
+
+    return await to_thread(tools.place_order, symbol=symbol, side=side,
+                           quantity=quantity, stop_price=stop_price,
+                           take_profit=take_profit)
+
+async def cancel_order(symbol:str, id:int) -> dict:
+    """
+    Cancel a order
+
+    Awaitable version of 'tradetools.cancel_order'.
+
+    Returns:
+        dict: Closed order.
+    """
+
+    return await to_thread(tools.cancel_order, symbol=symbol, id=id)
+
+async def open_orders(symbol:str, id:int=None) -> pd.DataFrame:
+    """
+    Open orders
+
+    Awaitable version of 'tradetools.open_orders'.
+
+    Returns:
+        pd.DataFrame: The orders.
+    """
+
+    return await to_thread(tools.open_orders, symbol=symbol, id=id)
+
+async def open_trades(symbol:str) -> pd.DataFrame:
+    """
+    Open trades
+
+    Awaitable version of 'tradetools.open_trades'.
+
+    Returns:
+        pd.DataFrame: Open trades.
+    """
+
+    return await to_thread(tools.open_trades, symbol=symbol)
+
+async def account_state(symbol:str) -> tuple:
+    """
+    Account state
+
+    Request balance, open trades and open orders of 'symbol' at the same time.
+
+    Args:
+        symbol (str): Symbol of trades and orders.
+
+    Returns:
+        tuple: balance, open trades, open orders.
+    """
+
+    return tuple(await asyncio.gather(
+        get_balance(), open_trades(symbol), open_orders(symbol)))
+
+def gather(*coroutines) -> list:
+    """
+    Gather
+
+    Execute the coroutines at the same time from synchronous code.
+
+    Note:
+        It cannot be called from a running event loop, use 'await asyncio.gather'.
+
+    Args:
+        *coroutines: Coroutines to execute.
+
+    Returns:
+        list: Results in the same order as 'coroutines'.
+    """
+
+    async def main():
+        return await asyncio.gather(*coroutines)
+
+    return asyncio.run(main())
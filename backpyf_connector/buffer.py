@@ -0,0 +1,181 @@
+"""
+Buffer module.
+
+This module contains the rolling buffer of the market data of the strategies.
+
+Note:
+    Each column is a NumPy array with capacity for 2 windows, the new candles
+    are written after the last one and when the array is full the last
+    window is moved to the start. So each window is always contiguous
+    and it can be returned as a view without copying it.
+
+Classes:
+    DataBuffer: Rolling buffer of the last candles by column.
+"""
+
+import pandas as pd
+import numpy as np
+
+class DataBuffer:
+    """
+    Data buffer.
+
+    Rolling buffer of the last candles by column.
+
+    Attributes:
+        columns: Column names.
+        size: Number of candles of the window.
+        start: Position of the first candle of the window.
+        end: Position after the last candle of the window.
+        index: Array of the timestamps.
+        values: Array of each column by column name.
+
+    Methods:
+        load: Load all the candles of a DataFrame.
+        update: Write the new candles of a DataFrame.
+        view: Returns a read only column of the window without copying it.
+        last: Returns the last value of a column.
+        frame: Returns the window as a DataFrame.
+    """
+
+    columns = ('Close', 'Open', 'High', 'Low', 'Volume')
+
+    def __init__(self) -> None:
+        """
+        __init__
+
+        Builder for initializing the class.
+        """
+
+        self.size = 0
+        self.start = 0
+        self.end = 0
+        self.index = np.empty(0, dtype=np.int64)
+        self.values = {i: np.empty(0, dtype=np.float64) for i in self.columns}
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def load(self, data:pd.DataFrame) -> None:
+        """
+        Load
+
+        Load all the candles of 'data', the arrays
+            are created again only if the window size changes.
+
+        Args:
+            data (pd.DataFrame): Candles.
+        """
+
+        if len(data) != self.size:
+            self.size = len(data)
+            self.index = np.empty(2*self.size, dtype=np.int64)
+            self.values = {i: np.empty(2*self.size, dtype=np.float64)
+                           for i in self.columns}
+
+        self.start, self.end = 0, self.size
+        self.index[:self.size] = data.index.to_numpy()
+        for i in self.columns:
+            self.values[i][:self.size] = data[i].to_numpy()
+
+    def update(self, data:pd.DataFrame) -> int:
+        """
+        Update
+
+        Write the candles of 'data' from the last one in place,
+            the last one is written again because it could be open 
+            in the previous step and have changed.
+
+        Note:
+            If 'data' does not continue the window or its size is
+            different all the candles are loaded with 'load'.
+
+        Args:
+            data (pd.DataFrame): Candles, the window is its last candles.
+
+        Returns:
+            int: Number of new candles.
+        """
+
+        if not len(self) or len(data) != self.size:
+            self.load(data)
+            return len(data)
+
+        index = data.index.to_numpy()
+        pos = index.searchsorted(self.index[self.end-1])
+
+        if pos >= len(index) or index[pos] != self.index[self.end-1]:
+            self.load(data)
+            return len(data)
+
+        new = len(index) - pos - 1
+
+        # Move the last candles to the start.
+        if self.end + new > 2*self.size:
+            keep = self.size - new
+            for i in (self.index, *self.values.values()):
+                i[:keep] = i[self.end-keep:self.end]
+            self.start, self.end = 0, keep
+
+        # The previous last candle is written again.
+        row = self.end - 1
+        self.index[row:self.end+new] = index[pos:]
+        for i in self.columns:
+            self.values[i][row:self.end+new] = data[i].to_numpy()[pos:]
+
+        self.end += new
+        self.start = self.end - self.size
+        return new
+
+    def view(self, column:str, last:int = None) -> np.ndarray:
+        """
+        View
+
+        Returns 'column' of the window without copying it.
+
+        Note:
+            The view is read only and it is only valid until the next 
+            'update' or 'load', it must be copied to keep it.
+
+        Args:
+            column (str): Column name or 'index'.
+            last (int, optional): Only the last candles.
+
+        Returns:
+            np.ndarray: View of the column.
+        """
+
+        array = self.index if column == 'index' else self.values[column]
+        start = self.start if last is None else max(self.end-last, self.start)
+
+        view = array[start:self.end].view()
+        view.flags.writeable = False
+        return view
+
+    def last(self, column:str):
+        """
+        Last
+
+        Returns the last value of 'column'.
+
+        Args:
+            column (str): Column name or 'index'.
+
+        Returns:
+            Last value.
+        """
+
+        return (self.index if column == 'index' else self.values[column])[self.end-1]
+
+    def frame(self) -> pd.DataFrame:
+        """
+        Frame
+
+        Returns the window as a DataFrame.
+
+        Returns:
+            pd.DataFrame: Candles with the 'timestamp' index.
+        """
+
+        return pd.DataFrame({i: self.view(i) for i in self.columns},
+                            index=pd.Index(self.view('index'), name='timestamp'))
@@ -0,0 +1,70 @@
+"""
+Client module.
+
+This module contains the Binance Futures client used by the system.
+
+Classes:
+    FuturesClient: 'UMFutures' client whose requests go through the 'limiter'.
+"""
+
+from binance.um_futures import UMFutures
+from binance.error import ClientError
+
+from . import limiter
+from . import clock
+
+class FuturesClient(UMFutures):
+    """
+    Futures client.
+
+    'UMFutures' client whose requests go through 'limiter.call',
+        the signed requests are signed again on each try with 
+        the Binance server time of 'clock.timestamp'.
+
+    Note:
+        If a signed request is rejected by the timestamp (-1021) the 
+        clock is synchronized and it is sent again once.
+
+    Methods:
+        query: Public request.
+        limit_request: Request with the API key.
+        sign_request: Signed request.
+        limited_encoded_sign_request: Signed request with the parameters in the url.
+    """
+
+    def query(self, url_path, payload=None):
+        return limiter.call(
+            lambda method, path, params: super(FuturesClient, self).query(path, params),
+            'GET', url_path, payload)
+
+    def limit_request(self, http_method, url_path, payload=None):
+        return limiter.call(super().limit_request, http_method, url_path, payload)
+
+    def sign_request(self, http_method, url_path, payload=None, special=False):
+        def sign(method, path, params):
+            params = params or {}
+            params['timestamp'] = clock.timestamp(self)
+            params['signature'] = self._get_sign(self._prepare_params(params, special))
+            return self.send_request(method, path, params, special)
+
+        return self.__synced(sign, http_method, url_path, payload)
+
+    def limited_encoded_sign_request(self, http_method, url_path, payload=None):
+        def sign(method, path, params):
+            params = params or {}
+            params['timestamp'] = clock.timestamp(self)
+            query_string = self._prepare_params(params)
+            return self.send_request(method, path + '?' + query_string 
+                                     + '&signature=' + self._get_sign(query_string))
+
+        return self.__synced(sign, http_method, url_path, payload)
+
+    def __synced(self, sign, http_method, url_path, payload):
+        try:
+            return limiter.call(sign, http_method, url_path, payload)
+        except ClientError as e:
+            if e.error_code != -1021:
+                raise
+
+        clock.sync_clock(self)
+        return limiter.call(sign, http_method, url_path, payload)
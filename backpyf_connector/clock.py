@@ -0,0 +1,103 @@
+"""
+Clock module.
+
+This module contains the synchronization with the Binance server time,
+    the signed requests use 'timestamp' so that they are not
+    rejected by the clock drift of the machine (-1021).
+
+Note:
+    The offset is measured with 'client.time()' compensating
+    half of the round trip time of the request.
+
+Functions:
+    sync_clock: Measure the offset to the Binance server time.
+    refresh_clock: Measure the offset again in the background.
+    timestamp: Returns the timestamp in milliseconds of the Binance server.
+"""
+
+from threading import Thread
+import time as te
+
+from . import _commons
+
+def sync_clock(client = None, samples:int = 3) -> float:
+    """
+    Sync clock
+
+    Measure the offset to the Binance server time and
+        save it in '_commons.__time_offset'.
+
+    Note:
+        The sample with the lowest round trip time is used.
+
+    Args:
+        client (UMFutures, optional): Binance client,
+            if None '_commons.__client' is used.
+        samples (int, optional): Number of requests made.
+
+    Returns:
+        float: Offset in milliseconds.
+    """
+
+    client = client or _commons.__client
+
+    best = None
+    for _ in range(samples):
+        start = te.time()
+        server = client.time()['serverTime']
+        end = te.time()
+
+        if best is None or end-start < best[0]:
+            best = (end-start, server - (start+end)*500)
+
+    _commons.__time_rtt = best[0]
+    _commons.__time_offset = best[1]
+    _commons.__time_sync = te.time()
+    return best[1]
+
+def refresh_clock() -> None:
+    """
+    Refresh clock
+
+    Measure the offset again in a background thread,
+        the current offset is used until it finishes.
+    """
+
+    if _commons.__time_loading:
+        return
+    _commons.__time_loading = True
+
+    def refresh():
+        try:
+            sync_clock()
+        except Exception:
+            pass
+        finally:
+            _commons.__time_loading = False
+
+    Thread(target=refresh, daemon=True).start()
+
+def timestamp(client = None) -> int:
+    """
+    Timestamp
+
+    Returns the timestamp in milliseconds of the Binance server.
+
+    Note:
+        The first time the offset is measured, then it is refreshed
+        in the background every '_commons.__time_ttl' seconds.
+
+    Args:
+        client (UMFutures, optional): Binance client used the first time,
+            if None '_commons.__client' is used.
+
+    Returns:
+        int: Timestamp.
+    """
+
+    if _commons.__time_sync is None:
+        sync_clock(client)
+    elif te.time()-_commons.__time_sync > _commons.__time_ttl:
+        refresh_clock()
+
+    return int(te.time()*1000 + _commons.__time_offset)
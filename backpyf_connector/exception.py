@@ -5,3 +5,4 @@ Custom exceptions.
 """
 
 class GenerateError(Exception):pass
+class RateLimitError(Exception):pass
@@ -0,0 +1,266 @@
+"""
+Limiter module.
+
+This module contains the rate limiter shared by all the requests
+    to the Binance API, so that the system is not banned (429/418).
+
+Note:
+    Each Binance limit (request weight and orders) is a token bucket in
+    '_commons.__limits', the requests take the weight of their endpoint and
+    the buckets are corrected with the 'X-MBX-USED-WEIGHT' and
+    'X-MBX-ORDER-COUNT' headers of each response.
+    The data and health check requests leave a reserve of the weight
+    ('_commons.__limit_reserve') so the orders are sent first.
+
+Functions:
+    set_limits: Create the buckets from the 'rateLimits' of 'exchangeInfo'.
+    endpoint_cost: Returns the priority, weight and orders of a request.
+    acquire: Wait until the request can be sent without exceeding the limits.
+    update: Hook of the client session that reads the limit headers.
+    call: Send a request with the limiter.
+    budget: Returns the current budget of each limit.
+"""
+
+from threading import Condition
+import time as te
+
+from binance.error import ClientError
+
+from . import exception
+from . import _commons
+
+__lock = Condition()
+
+# Binance Futures default limits.
+__default = [
+    {'rateLimitType': 'REQUEST_WEIGHT', 'interval': 'MINUTE', 'intervalNum': 1, 'limit': 2400},
+    {'rateLimitType': 'ORDERS', 'interval': 'SECOND', 'intervalNum': 10, 'limit': 300},
+    {'rateLimitType': 'ORDERS', 'interval': 'MINUTE', 'intervalNum': 1, 'limit': 1200},
+]
+
+# Weight of each endpoint, 1 if it is not here.
+__weights = {
+    '/fapi/v1/openOrders': 1,
+    '/fapi/v1/allOrders': 5,
+    '/fapi/v1/batchOrders': 5,
+    '/fapi/v1/userTrades': 5,
+    '/fapi/v1/income': 30,
+    '/fapi/v1/commissionRate': 20,
+    '/fapi/v2/positionRisk': 5,
+    '/fapi/v3/positionRisk': 5,
+    '/fapi/v2/balance': 5,
+    '/fapi/v3/balance': 5,
+    '/fapi/v2/account': 5,
+    '/fapi/v3/account': 5,
+}
+
+# Requests that are not data: orders (0) and health checks (2).
+__priorities = {
+    '/fapi/v1/order': 0,
+    '/fapi/v1/order/test': 0,
+    '/fapi/v1/batchOrders': 0,
+    '/fapi/v1/allOpenOrders': 0,
+    '/fapi/v1/ping': 2,
+    '/fapi/v1/time': 2,
+    '/fapi/v1/exchangeInfo': 2,
+}
+
+__seconds = {'SECOND': 1, 'MINUTE': 60, 'HOUR': 3600, 'DAY': 86400}
+
+def set_limits(rate_limits:list) -> None:
+    """
+    Set limits
+
+    Create the buckets from the 'rateLimits' of 'exchangeInfo'.
+
+    Note:
+        The bucket key is the suffix of its header, for example 'weight_1m'.
+
+    Args:
+        rate_limits (list): 'rateLimits' of 'exchangeInfo'.
+    """
+
+    limits = {}
+    for i in rate_limits:
+        if not i['rateLimitType'] in ('REQUEST_WEIGHT', 'ORDERS'):
+            continue
+
+        key = ('weight_' if i['rateLimitType'] == 'REQUEST_WEIGHT' else 'orders_')
+        key += f"{i['intervalNum']}{i['interval'][0].lower()}"
+        old = _commons.__limits.get(key, {})
+
+        limits[key] = {
+            'type': i['rateLimitType'],
+            'limit': i['limit'],
+            'seconds': i['intervalNum']*__seconds[i['interval']],
+            'tokens': min(old.get('tokens', i['limit']), i['limit']),
+            'time': old.get('time', te.time()),
+        }
+
+    with __lock:
+        _commons.__limits = limits
+
+def endpoint_cost(http_method:str, url_path:str, payload:dict = None) -> tuple:
+    """
+    Endpoint cost
+
+    Returns the priority, weight and orders of a request.
+
+    Args:
+        http_method (str): HTTP method.
+        url_path (str): Endpoint path.
+        payload (dict, optional): Request parameters.
+
+    Returns:
+        tuple: priority (0 orders, 1 data, 2 health check), weight, orders.
+    """
+
+    payload = payload or {}
+    path = url_path.split('?')[0]
+
+    weight = __weights.get(path, 1)
+    if path == '/fapi/v1/klines':
+        limit = int(payload.get('limit') or 500)
+        weight = 1 if limit < 100 else 2 if limit < 500 else 5 if limit <= 1000 else 10
+    elif path == '/fapi/v1/openOrders' and not payload.get('symbol'):
+        weight = 40
+
+    orders = 0
+    if http_method == 'POST' and path == '/fapi/v1/order':
+        orders = 1
+    elif http_method == 'POST' and path == '/fapi/v1/batchOrders':
+        orders = len(payload.get('batchOrders') or [])
+
+    return __priorities.get(path, 1), weight, orders
+
+def acquire(http_method:str, url_path:str, payload:dict = None) -> None:
+    """
+    Acquire
+
+    Wait until the request can be sent without exceeding the limits
+        and take its weight and orders from the buckets.
+
+    Note:
+        If Binance has banned the requests for more than
+        '_commons.__limit_wait' seconds 'exception.RateLimitError' is raised.
+
+    Args:
+        http_method (str): HTTP method.
+        url_path (str): Endpoint path.
+        payload (dict, optional): Request parameters.
+    """
+
+    priority, weight, orders = endpoint_cost(http_method, url_path, payload)
+
+    with __lock:
+        if not _commons.__limits:
+            set_limits(__default)
+
+        while True:
+            now = te.time()
+            wait = _commons.__limit_ban - now
+
+            if wait > _commons.__limit_wait:
+                raise exception.RateLimitError(
+                    f"Requests banned by Binance for {wait:.0f} seconds.")
+            elif wait <= 0:
+                wait = 0
+                for i in _commons.__limits.values():
+                    i['tokens'] = min(i['limit'], i['tokens']
+                                      + (now-i['time'])*i['limit']/i['seconds'])
+                    i['time'] = now
+
+                    reserve = i['limit']*_commons.__limit_reserve.get(priority, 0)
+                    cost = min(weight if i['type'] == 'REQUEST_WEIGHT' else orders,
+                               i['limit']-reserve)
+
+                    if cost > 0 and i['tokens']-reserve < cost:
+                        wait = max(wait, (cost+reserve-i['tokens'])*i['seconds']/i['limit'])
+
+                if not wait:
+                    for i in _commons.__limits.values():
+                        i['tokens'] -= weight if i['type'] == 'REQUEST_WEIGHT' else orders
+                    return
+
+            __lock.wait(wait)
+
+def update(response, *args, **kwargs) -> None:
+    """
+    Update
+
+    Hook of the client session that corrects the buckets with the
+        limit headers and saves the ban of the 429 and 418 responses.
+    """
+
+    now = te.time()
+    with __lock:
+        for key, value in response.headers.items():
+            key = key.lower()
+            if key.startswith('x-mbx-used-weight-'):
+                key = 'weight_' + key[18:]
+            elif key.startswith('x-mbx-order-count-'):
+                key = 'orders_' + key[18:]
+            else:
+                continue
+
+            if key in _commons.__limits:
+                bucket = _commons.__limits[key]
+                bucket['tokens'] = min(bucket['tokens'], bucket['limit']-float(value))
+
+        if response.status_code in (429, 418):
+            retry = float(response.headers.get('Retry-After') or
+                          (60 if response.status_code == 429 else 120))
+            _commons.__limit_ban = max(_commons.__limit_ban, now+retry)
+
+        __lock.notify_all()
+
+def call(function:callable, http_method:str, url_path:str,
+         payload:dict = None, *args, **kwargs):
+    """
+    Call
+
+    Send a request with the limiter, if the response is 429 it is
+        sent again after the 'Retry-After' up to '_commons.__limit_retries' times.
+
+    Args:
+        function (callable): Client function that sends the request.
+        http_method (str): HTTP method.
+        url_path (str): Endpoint path.
+        payload (dict, optional): Request parameters, copied on each try
+            because the signature is added to them.
+        *args: 'function' arguments.
+        **kwargs: 'function' keyword arguments.
+
+    Returns:
+        Result of 'function'.
+    """
+
+    for retry in range(_commons.__limit_retries+1):
+        acquire(http_method, url_path, payload)
+        try:
+            return function(http_method, url_path,
+                            None if payload is None else dict(payload), *args, **kwargs)
+        except ClientError as e:
+            if e.status_code != 429 or retry == _commons.__limit_retries:
+                raise
+
+def budget() -> dict:
+    """
+    Budget
+
+    Returns the current budget of each limit.
+
+    Returns:
+        dict: By bucket key: remaining, limit. And 'banned' with
+            the seconds left of the ban.
+    """
+
+    now = te.time()
+    with __lock:
+        result = {key: {'remaining': int(min(i['limit'], i['tokens']
+                                              + (now-i['time'])*i['limit']/i['seconds'])),
+                        'limit': i['limit']}
+                  for key, i in _commons.__limits.items()}
+
+    result['banned'] = max(_commons.__limit_ban-now, 0)
+    return result
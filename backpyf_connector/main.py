@@ -6,6 +6,8 @@ This module contains the main loop and the connection to the Binance client.
 Functions:
     print_log: This function handles logs by sending them to the console and others.
     add_rec: This function adds the record to the '_commons.__rec' variable.
+    count_call: Hook of the client session that counts the requests made.
+    print_calls: This function logs the requests made and the weight budget.
     set_client: Function that initializes the Binance client.
     set_data: This function set the symbol data and client configuration.
     set_search: Request symbol data to Binance API.
@@ -17,12 +19,12 @@ Functions:
     cls_instance: Create instance of 'cls', check exceptions.
     instance_execute: Executes the 'instance' strategy.
     generate_loop: This function generates the main loop.
+    generate_stream: This function generates the main loop in stream mode.
     class_execute: Execute your trading strategy in REAL once.
     class_group: Execute your trading strategy in REAL by automating it.
     telegram_bot: Run the Telegram bot by starting a new thread.
 """
 
-from binance.um_futures import UMFutures
 from datetime import datetime, timedelta
 from binance.api import ClientError
 from threading import Thread
@@ -31,7 +33,11 @@ import time as te
 import requests
 
 from . import tradetools as tools
+from .client import FuturesClient
 from . import exception
+from . import transport
+from . import limiter
+from . import clock
 from . import strategy
 from . import _commons
 
@@ -74,12 +80,42 @@ def add_rec(log:str, alert:bool=False) -> None:
     if len(_commons.__rec) > _commons.__rec_limit:
         _commons.__rec.pop(0)
 
+def count_call(response, *args, **kwargs) -> None:
+    """
+    Count call
+
+    Hook of the client session that counts the 
+        requests made in '_commons.__rest_calls'.
+    """
+
+    _commons.__rest_calls += 1
+
+def print_calls(calls:int) -> None:
+    """
+    Print calls
+
+    This function logs the requests made since 'calls' and the request weight budget.
+
+    Args:
+        calls (int): Value of '_commons.__rest_calls' before the execution.
+    """
+
+    weight = limiter.budget().get('weight_1m', {})
+    print_log(f"REST calls: {_commons.__rest_calls-calls}, "
+              f"weight budget: {weight.get('remaining')}/{weight.get('limit')}")
+
 def set_client(api_key:str, secret_key:str, test:bool = True) -> None:
     """
     Set client
 
     Function that initializes the Binance client.
 
+    Note:
+        The client of each API key is created once and saved 
+        in '_commons.__clients', all of them use the adapter of 
+        'transport.get_adapter', the rate limiter of the 'limiter' 
+        module and save their latency with 'transport.record_hook'.
+
     Args:
         api_key (str): Binance API key.
         secret_key (str): Binance API secret key.
@@ -87,9 +123,24 @@ def set_client(api_key:str, secret_key:str, test:bool = True) -> None:
             which instead of using the 'client.new_order' function uses 'client.new_order_test'.
     """
 
-    # Init futures client
-    client = UMFutures(api_key, secret_key,
-                    base_url="https://fapi.binance.com/")
+    # Init futures client, one by API key.
+    client = _commons.__clients.get(api_key)
+    if client is None or client.secret != secret_key:
+        client = FuturesClient(api_key, secret_key,
+                        base_url="https://fapi.binance.com/", timeout=_commons.__timeout)
+        client.session.hooks['response'].extend(
+            [count_call, limiter.update, transport.record_hook])
+
+        # All clients share the HTTP connection pool.
+        client.session.mount('https://', transport.get_adapter())
+
+        _commons.__clients[api_key] = client
+        _commons.__symbols = None
+        _commons.__config = {}
+        _commons.__orders = {}
+        _commons.__ledger = {}
+
+    _commons.__snapshot = None
 
     _commons.__client = client
     _commons.__function = client.new_order_test if test else client.new_order
@@ -107,7 +158,7 @@ def set_data(symbol:str, interval:str, leverage:int,
         leverage (str): Leverage used in futures.
         ps_type (str): Binance Margin Type.
         last (int): Amount of data from today back that you want to request.
-            Default 500, max 1000.
+            Default 500.
     """
 
     ## Set data
@@ -115,19 +166,18 @@ def set_data(symbol:str, interval:str, leverage:int,
     _commons.__interval = interval
     _commons.__leverage = leverage
     _commons.__ps_type = ps_type
+    _commons.__data = None
 
     while True:
         try: 
-            _commons.__client.change_leverage(symbol=symbol, leverage=leverage, 
-                                            recvWindow=_commons.__recvWindow)
+            tools.set_leverage(symbol=symbol, leverage=leverage)
         except ClientError as e:
             print_log(f"⚠️ Connection to Binance or Timestamp error.\nActual ip: {_commons.__ip_acc}.", alert=True)
             te.sleep(30); continue
         break
 
     try: 
-        _commons.__client.change_margin_type(symbol=symbol, marginType=ps_type, 
-                                             recvWindow=_commons.__recvWindow)
+        tools.set_margin_type(symbol=symbol, ps_type=ps_type)
     except ClientError: pass
 
     set_search(last)
@@ -138,14 +188,21 @@ def set_search(last:int) -> None:
 
     Request symbol data to Binance API.
 
+    Note:
+        Only the candles newer than the ones in '_commons.__data' are 
+        requested, to request all the data again set '_commons.__data' to None.
+
     Args:
         last (int): Amount of data from today back that you want to request.
-            Default 500, max 1000.
+            Default 500.
     """
 
-    _commons.__data = tools.fetch_data(_commons.__symbol, _commons.__interval, 
-                                       last=last)
-    _commons.__width = bk.utils.calc_width(_commons.__data.index)
+    data = _commons.__data
+    _commons.__data = tools.update_data(data, _commons.__symbol, 
+                                        _commons.__interval, last=last)
+
+    if data is None or _commons.__width is None:
+        _commons.__width = bk.utils.calc_width(_commons.__data.index)
 
 def calc_close(initial_close:datetime, time_close:int) -> datetime:
     """
@@ -180,7 +237,8 @@ def get_public_ip() -> str:
     """
 
     try:
-        response = requests.get("https://api.ipify.org?format=json")
+        response = transport.get_session().get(
+            "https://api.ipify.org?format=json", timeout=_commons.__timeout)
         response.raise_for_status()
 
         return response.json().get("ip")
@@ -216,12 +274,15 @@ def check_binance_connection() -> bool:
 
     This function verifies the connection to Binance.
 
+    Note:
+        The request of the server time is used to synchronize the clock.
+
     Return:
         bool: 'True' if the connection is still active, 'False' otherwise.
     """
 
     try:
-        _commons.__client.time()
+        clock.sync_clock(samples=1)
         return check_binance_connection_futures()
     except Exception as e:
         print_log(f"Error in the connection to Binance", alert=True)
@@ -263,8 +324,11 @@ def cls_instance(cls:type) -> strategy.StrategyClassReal:
     elif cls.__abstractmethods__:
         raise exception.GenerateError(
             "The implementation of the 'next' abstract method is missing.")
-    
-    cls.__bases__ = (strategy.StrategyClassReal,)
+
+    # 'StrategyClass' subclasses are connected to real.
+    if not issubclass(cls, strategy.StrategyClassReal):
+        cls.__bases__ = (strategy.StrategyClassReal,)
+
     return cls(
         symbol = _commons.__symbol, 
         interval = _commons.__interval, 
@@ -330,8 +394,10 @@ def generate_loop(function:callable, time_offset:float = 0, time_less:int = -60,
             not this_close in history.keys() and run
             ):
             try:
+                calls = _commons.__rest_calls
                 function()
                 print_log(f"Executed: {this_close}", alert=True)
+                print_calls(calls)
                 history[this_close] = True
             except Exception as e:
                 print_log(f"Error when executing the strategy: {e}", alert=True)
@@ -344,6 +410,38 @@ def generate_loop(function:callable, time_offset:float = 0, time_less:int = -60,
     _commons.__main_loop = True
     _commons.__instances = None
 
+def generate_stream(function:callable, last:int, 
+                    stream_url:str = "wss://fstream.binance.com",
+                    time_in:int = 30) -> None:
+    """
+    Generate stream
+
+    This function generates the main loop in stream mode, the strategy is 
+        executed by the kline stream as soon as each candle closes and 
+        every 'time_in' seconds the connections will be verified.
+
+    Args:
+        function (callable): Function where the strategy is executed.
+        last (int): Number of candles kept in '_commons.__data'.
+        stream_url (str, optional): Binance Futures WebSocket url.
+        time_in (int, optional): The value in seconds indicates how often the 
+            connections will be verified.
+    """
+
+    from . import stream
+
+    stream.kline_stream(function, last=last, stream_url=stream_url)
+
+    print_log('Sistem started.')
+    while _commons.__main_loop:
+        te.sleep(time_in)
+        check_connection()
+
+    stream.stop_stream()
+
+    _commons.__main_loop = True
+    _commons.__instances = None
+
 def class_execute(api_key:str, secret_key:str,
                   cls:type, symbol:str, interval:str, 
                   leverage:int, ps_type:str, last:int, test:bool = True) -> None:
@@ -367,7 +465,7 @@ def class_execute(api_key:str, secret_key:str,
         leverage (int): Binance Futures leverage.
         ps_type (str): Binance Futures margin type.
         last (int): The number of candles from today that you want 
-            to be loaded into your strategy to calculate it. Default 500, max 1000.
+            to be loaded into your strategy to calculate it. Default 500.
         test (bool, optional): If true, the test version will be run, 
             which instead of using the 'client.new_order' function uses 'client.new_order_test'.
             Test can still close orders.
@@ -386,7 +484,10 @@ def class_group(api_key:str, secret_key:str,
                 leverage:int, ps_type:str, last:int,
                 wrun:bool = False, time_offset:float = 0,
                 time_less:int = -60, time_in:int = 30, 
-                time_close:float = 1, test:bool = True) -> None:
+                time_close:float = 1, test:bool = True,
+                stream:bool = False, user_data:bool = False,
+                stream_url:str = "wss://fstream.binance.com",
+                processes:bool = False, paper = None) -> None:
     """
     Class group
 
@@ -396,6 +497,8 @@ def class_group(api_key:str, secret_key:str,
         This will be executed in the real market using the Binance API. 
         Before executing this insurance, please refer to 'Risk_notice.txt'.
         Test can still close orders.
+        It runs a single 'session.Session', use 'session.run_sessions' 
+        to trade several symbols in the same process.
 
     Args:
         api_key (str): Binance API key.
@@ -407,7 +510,7 @@ def class_group(api_key:str, secret_key:str,
         leverage (int): Binance Futures leverage.
         ps_type (str): Binance Futures margin type.
         last (int): The number of candles from today that you want 
-            to be loaded into your strategy to calculate it. Default 500, max 1000.
+            to be loaded into your strategy to calculate it. Default 500.
         wrun (bool, optional): Executes the strategy at the start.
         time_offset (float, optional): Argument that indicates when the first close of the day is.
             Calculated in days where hour 0 is added plus 'time_offset' which gives the first close of the day.
@@ -422,40 +525,53 @@ def class_group(api_key:str, secret_key:str,
         test (bool, optional): If true, the test version will be run, 
             which instead of using the 'client.new_order' function uses 'client.new_order_test'.
             Test can still close orders.
-    """
-
-    set_client(api_key=api_key, secret_key=secret_key, test=test)
-    set_data(symbol=symbol, interval=interval, leverage=leverage,
-             ps_type=ps_type, last=last)
-    
-    instances = []
-    _commons.__instances = []
-    for i in cls:
-        instances.append(cls_instance(cls=i))
-        _commons.__instances.append(instances[-1].__class__.__name__)
-
-    num_at = 0 if not tools.open_trades(symbol=_commons.__symbol).empty else None
-
-    def loop():
-        nonlocal num_at
-
-        set_search(last=last)
-        if num_at != None:
-            instance_execute(instances[num_at], num_at)
-
-            num_at = num_at if not tools.open_trades(symbol=_commons.__symbol).empty else None
-            return
-
-        for n, i in enumerate(instances):
-            instance_execute(i, n+1)
-
-            if not tools.open_trades(symbol=_commons.__symbol).empty:
-                num_at = n; break
-
-    if wrun: loop()
-
-    generate_loop(loop, time_offset=time_offset, time_less=time_less,
-                  time_in=time_in, time_close=time_close)
+        stream (bool, optional): If true, the strategy is executed by the kline 
+            stream as soon as each candle closes instead of the 'time_in' loop.
+            'time_offset', 'time_less' and 'time_close' are not used.
+        user_data (bool, optional): If true, the open orders and trades are kept 
+            updated by the user data stream instead of being requested every time.
+        stream_url (str, optional): Binance Futures WebSocket url used in stream mode
+            and by the user data stream.
+        processes (bool, optional): If true, the strategies are evaluated at 
+            the same time in worker processes and their orders are sent by 
+            the main process in the order of 'cls', see 'parallel'.
+            In the workers the actions return a tuple of None because 
+            the orders are sent after 'next'.
+        paper (PaperClient, optional): If not None, the strategy is executed on 
+            each candle of this simulated client without network instead of 
+            the loop, see 'paper'. 'stream' and 'user_data' are not used.
+    """
+
+    from .stream import user_stream, stop_user_stream
+    from .session import Session
+
+    session = Session(api_key=api_key, secret_key=secret_key, cls=cls, 
+                      symbol=symbol, interval=interval, leverage=leverage,
+                      ps_type=ps_type, last=last, time_offset=time_offset, 
+                      time_less=time_less, time_close=time_close, test=test,
+                      processes=processes)
+
+    if paper != None:
+        from .paper import register, run_paper
+
+        register(paper, api_key=api_key, secret_key=secret_key)
+        run_paper(session, paper)
+        session.stop(); return
+
+    session.start()
+
+    if user_data: user_stream([symbol], stream_url=stream_url)
+    if wrun: session.tick(search=not stream)
+
+    if stream:
+        generate_stream(lambda: session.tick(search=False), last=last, 
+                        stream_url=stream_url, time_in=time_in)
+    else:
+        generate_loop(session.tick, time_offset=time_offset, time_less=time_less,
+                      time_in=time_in, time_close=time_close)
+
+    session.stop()
+    stop_user_stream()
 
 def telegram_bot(api_key:str, chatid:str = ""):
     """
@@ -0,0 +1,737 @@
+"""
+Paper module.
+
+This module contains a local simulation of the Binance Futures API,
+    the strategies can be executed without network over saved candles
+    with positions, protective orders and commissions.
+
+Note:
+    'PaperClient' implements the 'UMFutures' requests used by 'tradetools'
+    in one-way mode with a single 'USDT' wallet. The market orders are filled
+    at the close of the current candle and the 'STOP_MARKET' and
+    'TAKE_PROFIT_MARKET' orders are triggered by the high and low of the
+    next candles, if both are triggered in the same candle the stop is first.
+    There is no liquidation or funding.
+
+Classes:
+    PaperClient: Simulated Binance Futures client.
+
+Functions:
+    register: Use a 'PaperClient' as the client of an API key.
+    run_paper: Execute a session on each candle of a 'PaperClient'.
+"""
+
+from threading import RLock
+import pandas as pd
+import random
+import time as te
+
+from binance.error import ClientError
+
+from . import tradetools as tools
+from . import rounding
+from . import _commons
+from . import clock
+
+def error(code:int, message:str) -> ClientError:
+    """
+    Error
+
+    Returns the error of the Binance API with 'code' and 'message'.
+
+    Args:
+        code (int): Binance error code.
+        message (str): Error message.
+
+    Returns:
+        ClientError: Error.
+    """
+
+    return ClientError(400, code, message, {})
+
+def flag(value) -> bool:
+    """
+    Flag
+
+    Returns the boolean of a request parameter, True or 'true'.
+
+    Args:
+        value: Parameter value.
+
+    Returns:
+        bool: Value.
+    """
+
+    return str(value).lower() == 'true'
+
+class PaperClient:
+    """
+    Paper client.
+
+    Simulated Binance Futures client over the candles of 'data',
+        the candles after 'cursor' are not visible until 'advance'.
+
+    Attributes:
+        api_key: API key used with 'register'.
+        secret: Secret key checked by 'main.set_client'.
+        symbol: Symbol of the candles.
+        interval: Interval of the candles.
+        data: Candles.
+        cursor: Position of the current candle.
+        wallet: Balance in 'USDT' without the unrealized profit.
+        leverage: Leverage of the symbol.
+        commission: Commission rate of each fill.
+        latency: Seconds added to each request, with a tuple
+            a random value between the two.
+        calls: Number of requests.
+
+    Private Attributes:
+        __lock: Lock of the requests, 'tradetools' sends them from several threads.
+        __step: Interval in milliseconds.
+        __klines: Candles in the format of the Binance API.
+        __filters: 'tickSize', 'stepSize' and 'minNotional'.
+        __margin_type: Margin type of the symbol.
+        __position: Amount, entry price and update time of the position.
+        __orders: All the orders by 'orderId'.
+        __trades: Fills from oldest to newest.
+        __ids: Last order id and last trade id.
+
+    Methods:
+        seek: Move the current candle.
+        advance: Move to the next candles and trigger the orders.
+        time: Server time.
+        exchange_info: Symbol filters.
+        commission_rate: Commission of the symbol.
+        change_leverage: Change the leverage.
+        change_margin_type: Change the margin type.
+        klines: Candles until the current one.
+        balance: Wallet.
+        get_position_risk: Open position.
+        get_account_trades: Fills.
+        get_orders: Open orders.
+        get_all_orders: All the orders.
+        new_order: Create an order.
+        new_order_test: Create an order, the same as 'new_order'.
+        new_batch_order: Create several orders.
+        cancel_order: Cancel an order.
+        cancel_batch_order: Cancel several orders.
+        cancel_open_orders: Cancel all the open orders.
+    """
+
+    def __init__(self, data:pd.DataFrame, symbol:str, interval:str,
+                 balance:float = 1000, commission:float = 0.0004,
+                 tick_size:float = 0.01, step_size:float = 0.001,
+                 min_notional:float = 5, latency = 0, start:int = 0,
+                 api_key:str = 'paper', secret:str = 'paper') -> None:
+        """
+        __init__
+
+        Builder for initializing the class.
+
+        Args:
+            data (pd.DataFrame): Candles with the format of 'tradetools.fetch_data',
+                'Close', 'Open', 'High', 'Low' and 'Volume' by open time in ms.
+            symbol (str): Symbol of the candles.
+            interval (str): Binance interval of the candles.
+            balance (float, optional): Initial balance in 'USDT'.
+            commission (float, optional): Commission rate of each fill.
+            tick_size (float, optional): Price step.
+            step_size (float, optional): Amount step.
+            min_notional (float, optional): Minimum value of the orders.
+            latency (float | tuple, optional): Seconds added to each request,
+                with a tuple a random value between the two.
+            start (int, optional): Position of the first current candle.
+            api_key (str, optional): API key used with 'register'.
+            secret (str, optional): Secret key checked by 'main.set_client'.
+        """
+
+        self.api_key = api_key
+        self.secret = secret
+        self.symbol = symbol
+        self.interval = interval
+        self.data = data
+        self.cursor = 0
+        self.wallet = float(balance)
+        self.leverage = 1
+        self.commission = commission
+        self.latency = latency
+        self.calls = 0
+
+        self.__lock = RLock()
+        self.__step = tools.interval_ms(interval)
+        self.__klines = [
+            [int(t), str(o), str(h), str(l), str(c), str(v),
+             int(t)+self.__step-1, str(c*v), 0, '0', '0', '0']
+            for t, c, o, h, l, v in zip(data.index, data['Close'], data['Open'],
+                                        data['High'], data['Low'], data['Volume'])]
+        self.__filters = {'tickSize': tick_size, 'stepSize': step_size,
+                          'minNotional': min_notional}
+        self.__margin_type = 'CROSSED'
+        self.__position = {'amount': 0., 'entry': 0., 'time': 0}
+        self.__orders = {}
+        self.__trades = []
+        self.__ids = [0, 0]
+
+        self.seek(start)
+
+    @property
+    def now(self) -> int:
+        """
+        Now
+
+        Simulated time in ms, just before the close of the current candle.
+        """
+
+        return self.__klines[self.cursor][6]
+
+    @property
+    def price(self) -> float:
+        """
+        Price
+
+        Close of the current candle, used as the mark price.
+        """
+
+        return float(self.__klines[self.cursor][4])
+
+    def seek(self, position:int) -> None:
+        """
+        Seek
+
+        Move the current candle to 'position' without triggering the orders.
+
+        Args:
+            position (int): Position in 'data'.
+        """
+
+        self.cursor = min(max(position, 0), len(self.__klines)-1)
+
+    def advance(self, steps:int = 1) -> bool:
+        """
+        Advance
+
+        Move to the next candles and trigger the
+            protective orders with each one.
+
+        Args:
+            steps (int, optional): Number of candles.
+
+        Returns:
+            bool: False if there are no more candles.
+        """
+
+        with self.__lock:
+            for _ in range(steps):
+                if self.cursor+1 >= len(self.__klines):
+                    return False
+
+                self.cursor += 1
+                self.__match()
+
+        return True
+
+    def __match(self) -> None:
+        """
+        Match
+
+        Trigger the open 'STOP_MARKET' and 'TAKE_PROFIT_MARKET' orders
+            with the high and low of the current candle, the stops first.
+
+        Note:
+            If the price opens after the stop price the order is filled at the open.
+            The 'closePosition' orders without a position to close are expired.
+        """
+
+        _, open, high, low = (float(i) for i in self.__klines[self.cursor][:4])
+
+        orders = sorted((i for i in self.__orders.values() if i['status'] == 'NEW'),
+                        key=lambda x: (x['type'] != 'STOP_MARKET', x['orderId']))
+        for order in orders:
+            stop = float(order['stopPrice'])
+            falls = (order['side'] == 'SELL') == (order['type'] == 'STOP_MARKET')
+
+            if (low > stop) if falls else (high < stop):
+                continue
+
+            amount = self.__position['amount']
+            if not amount or (amount > 0) != (order['side'] == 'SELL'):
+                order.update(status='EXPIRED', updateTime=self.now)
+                continue
+
+            quantity = (abs(amount) if order['closePosition']
+                        else min(float(order['origQty']), abs(amount)))
+            self.__fill(order, quantity, min(open, stop) if falls else max(open, stop))
+
+    def __fill(self, order:dict, quantity:float, price:float) -> None:
+        """
+        Fill
+
+        Execute 'order', update the position and the wallet and save the fill.
+
+        Args:
+            order (dict): Order.
+            quantity (float): Amount filled.
+            price (float): Fill price.
+        """
+
+        step = self.__filters['stepSize']
+        signed = quantity if order['side'] == 'BUY' else -quantity
+        amount, entry = self.__position['amount'], self.__position['entry']
+
+        realized = 0.
+        if amount and (amount > 0) != (signed > 0):
+            realized = (price-entry) * min(quantity, abs(amount)) * (1 if amount > 0 else -1)
+
+        new = rounding.round_step(amount+signed, step, 'nearest')
+        if not new:
+            entry = 0.
+        elif not amount or (amount > 0) != (new > 0):
+            entry = price
+        elif abs(new) > abs(amount):
+            entry = (entry*abs(amount) + price*quantity) / abs(new)
+
+        commission = price*quantity*self.commission
+        self.wallet += realized-commission
+        self.__position.update(amount=new, entry=entry, time=self.now)
+
+        self.__ids[1] += 1
+        self.__trades.append({
+            'id': self.__ids[1],
+            'orderId': order['orderId'],
+            'symbol': self.symbol,
+            'side': order['side'],
+            'price': str(price),
+            'qty': str(quantity),
+            'realizedPnl': str(realized),
+            'marginAsset': 'USDT',
+            'quoteQty': str(price*quantity),
+            'commission': str(commission),
+            'commissionAsset': 'USDT',
+            'time': self.now,
+            'positionSide': 'BOTH',
+            'buyer': order['side'] == 'BUY',
+            'maker': False,
+        })
+        order.update(status='FILLED', avgPrice=str(price), executedQty=str(quantity),
+                     cumQuote=str(price*quantity), updateTime=self.now)
+
+    def __request(self, symbol:str = None) -> None:
+        """
+        Request
+
+        Count the request, wait the latency and check 'symbol'.
+
+        Args:
+            symbol (str, optional): Symbol of the request.
+        """
+
+        self.calls += 1
+        if self.latency:
+            te.sleep(random.uniform(*self.latency)
+                     if isinstance(self.latency, tuple) else self.latency)
+
+        if symbol != None and symbol != self.symbol:
+            raise error(-1121, 'Invalid symbol.')
+
+    def __equity(self) -> tuple:
+        """
+        Equity
+
+        Returns the unrealized profit and the available balance.
+
+        Returns:
+            tuple: Unrealized profit, available balance.
+        """
+
+        amount = self.__position['amount']
+        profit = (self.price-self.__position['entry']) * amount
+
+        return profit, self.wallet + profit - abs(amount)*self.price/self.leverage
+
+    def time(self, **kwargs) -> dict:
+        self.__request()
+        return {'serverTime': self.now}
+
+    def exchange_info(self, **kwargs) -> dict:
+        self.__request()
+        return {
+            'timezone': 'UTC',
+            'serverTime': self.now,
+            'rateLimits': [],
+            'symbols': [{
+                'symbol': self.symbol,
+                'status': 'TRADING',
+                'contractType': 'PERPETUAL',
+                'pricePrecision': rounding.step_units(self.__filters['tickSize'])[1],
+                'quantityPrecision': rounding.step_units(self.__filters['stepSize'])[1],
+                'filters': [
+                    {'filterType': 'PRICE_FILTER',
+                     'tickSize': str(self.__filters['tickSize'])},
+                    {'filterType': 'LOT_SIZE',
+                     'stepSize': str(self.__filters['stepSize'])},
+                    {'filterType': 'MIN_NOTIONAL',
+                     'notional': str(self.__filters['minNotional'])},
+                ],
+            }],
+        }
+
+    def commission_rate(self, symbol:str, **kwargs) -> dict:
+        self.__request(symbol)
+        return {'symbol': symbol, 'makerCommissionRate': str(self.commission),
+                'takerCommissionRate': str(self.commission)}
+
+    def change_leverage(self, symbol:str, leverage:int, **kwargs) -> dict:
+        self.__request(symbol)
+        with self.__lock:
+            self.leverage = int(leverage)
+
+        return {'symbol': symbol, 'leverage': self.leverage, 'maxNotionalValue': '0'}
+
+    def change_margin_type(self, symbol:str, marginType:str, **kwargs) -> dict:
+        self.__request(symbol)
+        with self.__lock:
+            if marginType.upper() == self.__margin_type:
+                raise error(-4046, 'No need to change margin type.')
+            self.__margin_type = marginType.upper()
+
+        return {'code': 200, 'msg': 'success'}
+
+    def klines(self, symbol:str, interval:str, limit:int = 500,
+               startTime:int = None, endTime:int = None, **kwargs) -> list:
+        self.__request(symbol)
+        if interval != self.interval:
+            raise error(-1120, 'Invalid interval.')
+
+        with self.__lock:
+            end = self.cursor+1
+            if endTime != None:
+                end = min(end, self.data.index.searchsorted(endTime, side='right'))
+
+            if startTime is None:
+                return self.__klines[max(end-limit, 0):end]
+
+            start = self.data.index.searchsorted(startTime)
+            return self.__klines[start:min(start+limit, end)]
+
+    def balance(self, **kwargs) -> list:
+        self.__request()
+        with self.__lock:
+            profit, available = self.__equity()
+
+            return [{
+                'accountAlias': 'paper',
+                'asset': 'USDT',
+                'balance': str(self.wallet),
+                'crossWalletBalance': str(self.wallet),
+                'crossUnPnl': str(profit),
+                'availableBalance': str(available),
+                'maxWithdrawAmount': str(max(available, 0)),
+                'marginAvailable': True,
+                'updateTime': self.now,
+            }]
+
+    def get_position_risk(self, symbol:str = None, **kwargs) -> list:
+        self.__request(symbol)
+        with self.__lock:
+            amount, entry = self.__position['amount'], self.__position['entry']
+            if not amount:
+                return []
+
+            return [{
+                'symbol': self.symbol,
+                'positionAmt': str(amount),
+                'entryPrice': str(entry),
+                'breakEvenPrice': str(entry),
+                'markPrice': str(self.price),
+                'unRealizedProfit': str(self.__equity()[0]),
+                'liquidationPrice': '0',
+                'leverage': str(self.leverage),
+                'maxNotionalValue': '0',
+                'marginType': self.__margin_type.lower(),
+                'isolatedMargin': '0',
+                'isAutoAddMargin': 'false',
+                'positionSide': 'BOTH',
+                'notional': str(amount*self.price),
+                'isolatedWallet': '0',
+                'updateTime': self.__position['time'],
+            }]
+
+    def get_account_trades(self, symbol:str, startTime:int = None, endTime:int = None,
+                           fromId:int = None, limit:int = 500, **kwargs) -> list:
+        self.__request(symbol)
+        with self.__lock:
+            if fromId != None:
+                trades = [i for i in self.__trades if i['id'] >= fromId][:limit]
+            else:
+                trades = [i for i in self.__trades
+                          if (startTime is None or i['time'] >= startTime) and
+                          (endTime is None or i['time'] <= endTime)][-limit:]
+
+            return [dict(i) for i in trades]
+
+    def get_orders(self, symbol:str = None, **kwargs) -> list:
+        self.__request(symbol)
+        with self.__lock:
+            return [dict(i) for i in self.__orders.values() if i['status'] == 'NEW']
+
+    def get_all_orders(self, symbol:str, orderId:int = None, limit:int = 500,
+                       **kwargs) -> list:
+        self.__request(symbol)
+        with self.__lock:
+            return [dict(i) for i in self.__orders.values()
+                    if orderId is None or i['orderId'] >= orderId][:limit]
+
+    def new_order(self, symbol:str, side:str, type:str, quantity = None,
+                  stopPrice = None, closePosition = None, reduceOnly = None,
+                  **kwargs) -> dict:
+        self.__request(symbol)
+        with self.__lock:
+            return self.__new_order(side=side, type_=type, quantity=quantity,
+                                    stop_price=stopPrice, close=flag(closePosition),
+                                    reduce=flag(reduceOnly))
+
+    def new_order_test(self, **kwargs) -> dict:
+        return self.new_order(**kwargs)
+
+    def new_batch_order(self, batchOrders:list, **kwargs) -> list:
+        self.__request()
+        if len(batchOrders) > 5:
+            raise error(-1102, 'The batch request accepts 5 orders at most.')
+
+        results = []
+        with self.__lock:
+            for i in batchOrders:
+                try:
+                    if i.get('symbol') != self.symbol:
+                        raise error(-1121, 'Invalid symbol.')
+
+                    results.append(self.__new_order(
+                        side=i['side'], type_=i['type'], quantity=i.get('quantity'),
+                        stop_price=i.get('stopPrice'), close=flag(i.get('closePosition')),
+                        reduce=flag(i.get('reduceOnly'))))
+                except ClientError as e:
+                    results.append({'code': e.error_code, 'msg': e.error_message})
+
+        return results
+
+    def __new_order(self, side:str, type_:str, quantity = None, stop_price = None,
+                    close:bool = False, reduce:bool = False) -> dict:
+        """
+        New order
+
+        Check and create an order, the 'MARKET' orders are filled.
+
+        Args:
+            side (str): 'BUY' or 'SELL'.
+            type_ (str): 'MARKET', 'STOP_MARKET' or 'TAKE_PROFIT_MARKET'.
+            quantity (optional): Order amount.
+            stop_price (optional): Trigger price.
+            close (bool, optional): Close all the position.
+            reduce (bool, optional): Only reduce the position.
+
+        Returns:
+            dict: Order.
+        """
+
+        if not side in ('BUY', 'SELL'):
+            raise error(-1117, 'Invalid side.')
+
+        # The quantity is optional only with 'closePosition'.
+        quantity = float(quantity) if not quantity is None else 0.
+        if (not close or quantity) and not quantity > 0:
+            raise error(-4003, 'Quantity less than or equal to zero.')
+        elif (not close and rounding.round_step(
+            quantity, self.__filters['stepSize'], 'nearest') != quantity):
+            raise error(-1111, 'Precision is over the maximum defined for this asset.')
+
+        amount = self.__position['amount']
+        signed = quantity if side == 'BUY' else -quantity
+
+        if type_ == 'MARKET':
+            if close:
+                raise error(-4136, 'Target strategy invalid for orderType MARKET,closePosition true')
+            elif reduce and (not amount or (amount > 0) == (signed > 0)
+                             or quantity > abs(amount)):
+                raise error(-2022, 'ReduceOnly Order is rejected.')
+            elif abs(amount+signed) > abs(amount):
+                if quantity*self.price < self.__filters['minNotional']:
+                    raise error(-4164, "Order's notional must be no smaller than "
+                                f"{self.__filters['minNotional']} (unless you choose reduce only).")
+                elif (abs(amount+signed)-abs(amount))*self.price/self.leverage > self.__equity()[1]:
+                    raise error(-2019, 'Margin is insufficient.')
+
+        elif type_ in ('STOP_MARKET', 'TAKE_PROFIT_MARKET'):
+            if stop_price is None:
+                raise error(-1102, "Mandatory parameter 'stopPrice' was not sent, "
+                            "was empty/null, or malformed.")
+
+            stop = float(stop_price)
+            if rounding.round_step(stop, self.__filters['tickSize'], 'nearest') != stop:
+                raise error(-1111, 'Precision is over the maximum defined for this asset.')
+            elif (self.price <= stop if (side == 'SELL') == (type_ == 'STOP_MARKET')
+                  else self.price >= stop):
+                raise error(-2021, 'Order would immediately trigger.')
+
+        else:
+            raise error(-1116, 'Invalid orderType.')
+
+        self.__ids[0] += 1
+        order = {
+            'orderId': self.__ids[0],
+            'symbol': self.symbol,
+            'status': 'NEW',
+            'clientOrderId': f"paper_{self.__ids[0]}",
+            'price': '0',
+            'avgPrice': '0',
+            'origQty': str(quantity),
+            'executedQty': '0',
+            'cumQuote': '0',
+            'timeInForce': 'GTC',
+            'type': type_,
+            'reduceOnly': reduce or close,
+            'closePosition': close,
+            'side': side,
+            'positionSide': 'BOTH',
+            'stopPrice': str(float(stop_price or 0)),
+            'workingType': 'CONTRACT_PRICE',
+            'priceProtect': False,
+            'origType': type_,
+            'time': self.now,
+            'updateTime': self.now,
+        }
+        self.__orders[order['orderId']] = order
+
+        if type_ == 'MARKET':
+            self.__fill(order, quantity, self.price)
+
+        return dict(order)
+
+    def cancel_order(self, symbol:str, orderId:int = None, **kwargs) -> dict:
+        self.__request(symbol)
+        with self.__lock:
+            return self.__cancel(orderId)
+
+    def cancel_batch_order(self, symbol:str, orderIdList:list = None,
+                           origClientOrderIdList:list = None, **kwargs) -> list:
+        self.__request(symbol)
+        if len(orderIdList or []) > 10:
+            raise error(-1102, 'The batch request accepts 10 orders at most.')
+
+        results = []
+        with self.__lock:
+            for i in orderIdList or []:
+                try:
+                    results.append(self.__cancel(i))
+                except ClientError as e:
+                    results.append({'code': e.error_code, 'msg': e.error_message})
+
+        return results
+
+    def cancel_open_orders(self, symbol:str, **kwargs) -> dict:
+        self.__request(symbol)
+        with self.__lock:
+            for i in self.__orders.values():
+                if i['status'] == 'NEW':
+                    i.update(status='CANCELED', updateTime=self.now)
+
+        return {'code': 200, 'msg': 'The operation of cancel all open order is done.'}
+
+    def __cancel(self, id) -> dict:
+        """
+        Cancel
+
+        Cancel the open order 'id'.
+
+        Args:
+            id: Order id.
+
+        Returns:
+            dict: Canceled order.
+        """
+
+        order = self.__orders.get(int(id or 0))
+        if order is None or order['status'] != 'NEW':
+            raise error(-2011, 'Unknown order sent.')
+
+        order.update(status='CANCELED', updateTime=self.now)
+        return dict(order)
+
+def register(client:PaperClient, api_key:str = None, secret_key:str = None) -> None:
+    """
+    Register
+
+    Use 'client' as the Binance client of 'api_key' in 'main.set_client'.
+
+    Note:
+        The symbols, configuration, orders and ledger
+        saved from the previous client are removed.
+
+    Args:
+        client (PaperClient): Simulated client.
+        api_key (str, optional): API key, if None 'client.api_key'.
+        secret_key (str, optional): Secret key, if None 'client.secret'.
+    """
+
+    client.api_key = api_key or client.api_key
+    client.secret = secret_key or client.secret
+
+    _commons.__clients[client.api_key] = client
+    _commons.__symbols = None
+    _commons.__config = {}
+    _commons.__orders = {}
+    _commons.__ledger = {}
+    _commons.__snapshot = None
+    _commons.__time_sync = None
+
+def run_paper(session, client:PaperClient, steps:int = None) -> int:
+    """
+    Run paper
+
+    Execute 'session' on the current candle of 'client' and on each
+        next one until the last, as 'main.generate_loop' does at each close.
+
+    Note:
+        'session' must use the API key of 'client' (see 'register'),
+        it is started if it has no strategies.
+        The clock of 'clock.timestamp' follows the simulated time and
+        the store of '_commons.__store_dir' is not used while it runs.
+        Without latency the requests of 'tools.run_concurrent' are made 
+        one after the other, the thread pool would be slower.
+
+    Args:
+        session (Session): Session of the symbol of 'client'.
+        client (PaperClient): Simulated client.
+        steps (int, optional): Maximum number of executions.
+
+    Returns:
+        int: Number of executions.
+    """
+
+    store_dir, _commons.__store_dir = _commons.__store_dir, None
+    workers = _commons.__max_workers
+    if not client.latency: _commons.__max_workers = 1
+
+    ticks = 0
+    try:
+        client.seek(max(client.cursor, session.last-1))
+        clock.sync_clock(client, samples=1)
+
+        if not session.instances:
+            session.start()
+
+        while steps is None or ticks < steps:
+            session.tick()
+            ticks += 1
+
+            if not client.advance():
+                break
+
+            # The protective orders can be filled without a request.
+            clock.sync_clock(client, samples=1)
+            tools.invalidate_ledger(client.symbol)
+    finally:
+        _commons.__store_dir = store_dir
+        _commons.__max_workers = workers
+        _commons.__time_sync = None
+
+    return ticks
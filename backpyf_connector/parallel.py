@@ -0,0 +1,269 @@
+"""
+Parallel module.
+
+This module contains the evaluation of the strategies in worker processes,
+    each strategy runs 'next' in its own process over the market data
+    shared in memory and its actions are sent back to be executed.
+
+Note:
+    The workers are created with 'fork' so the instances of the strategies
+    are copied with their state, if 'fork' is not available the strategies
+    are evaluated in the main process.
+    The workers are started by 'session.Session.start' before the streams,
+    the child does not use the connections or locks copied from the main
+    process, 'reset_child' creates them again.
+    The actions ('act_open', 'act_close' and 'act_mod') are not executed in
+    the workers, they are saved and executed in the main process in the
+    order of the strategies, so during 'next' the strategy does not see
+    the trades opened in the same step.
+    The attributes changed in 'next' are only kept in the worker.
+
+Classes:
+    StrategyPool: Worker processes of the strategies of a session.
+
+Functions:
+    reset_child: Replace the connections and locks copied by 'fork'.
+    worker: Loop of a worker process.
+"""
+
+from multiprocessing import shared_memory
+from threading import Lock, Condition, RLock
+import multiprocessing as mp
+
+import requests
+
+import pandas as pd
+import numpy as np
+
+from . import _commons, transport, limiter, stream
+
+# Timestamp and the data columns.
+COLUMNS = ('Close', 'Open', 'High', 'Low', 'Volume')
+
+def reset_child() -> None:
+    """
+    Reset child
+
+    Replace in a worker process the connections and locks copied by 'fork'.
+
+    Note:
+        A lock held by a thread of the main process when it was copied stays
+        held in the child, and the HTTP connections of the adapter are shared
+        with the main process, so each client gets a new session.
+    """
+
+    transport.__lock = Lock()
+    limiter.__lock = Condition()
+    stream.__lock = Lock()
+
+    _commons.__adapter = None
+    _commons.__http = None
+    _commons.__time_loading = False
+
+    for client in _commons.__clients.values():
+        if hasattr(client, '_PaperClient__lock'):
+            client._PaperClient__lock = RLock()
+        if not isinstance(getattr(client, 'session', None), requests.Session):
+            continue
+
+        session = requests.Session()
+        session.headers.update(client.session.headers)
+        session.hooks['response'].extend(client.session.hooks['response'])
+        session.mount('https://', transport.get_adapter())
+        client.session = session
+
+def worker(instance, connection, name:str, shape:tuple) -> None:
+    """
+    Worker
+
+    Loop of a worker process, for each message the data is read from the
+        shared memory 'name' and 'instance' is evaluated, the actions or
+        the error are sent back.
+
+    Note:
+        The message is None to finish, or a tuple with the number of rows,
+        the data if it did not fit in the shared memory, the account
+        snapshot and the commission.
+
+    Args:
+        instance (StrategyClassReal): Strategy evaluated.
+        connection (Connection): Pipe to the main process.
+        name (str): Name of the shared memory.
+        shape (tuple): Shape of the shared memory array.
+    """
+
+    reset_child()
+
+    memory = shared_memory.SharedMemory(name=name)
+    array = np.ndarray(shape, dtype=np.float64, buffer=memory.buf)
+
+    try:
+        while (message:=connection.recv()) is not None:
+            rows, data, snapshot, commission = message
+
+            if data is None:
+                data = pd.DataFrame(array[:rows, 1:], columns=COLUMNS,
+                                    index=pd.Index(array[:rows, 0].astype(np.int64),
+                                                   name='timestamp'))
+            _commons.__snapshot = snapshot
+
+            try:
+                connection.send((instance._StrategyClassReal__record_before(
+                    data=data, commission=commission), None))
+            except Exception as e:
+                connection.send((None, f"{type(e).__name__}: {e}"))
+    except EOFError:
+        pass
+    finally:
+        del array
+        memory.close()
+
+class StrategyPool:
+    """
+    Strategy pool.
+
+    Worker processes of the strategies of a session,
+        one process by strategy.
+
+    Attributes:
+        instances: Instances of the strategies.
+        size: Maximum number of candles of the shared memory.
+
+    Private Attributes:
+        __memory: Shared memory of the market data.
+        __array: Array of the shared memory, timestamp and 'COLUMNS' by row.
+        __workers: Process and pipe of each strategy, None if not started.
+
+    Methods:
+        start: Create the shared memory and the worker processes.
+        evaluate: Evaluate the strategies and return their actions.
+        close: Finish the worker processes.
+    """
+
+    def __init__(self, instances:list, size:int) -> None:
+        """
+        __init__
+
+        Builder for initializing the class.
+
+        Args:
+            instances (list): Instances of the strategies.
+            size (int): Maximum number of candles, if the data is bigger
+                it is sent to the workers by the pipe.
+        """
+
+        self.instances = instances
+        self.size = max(size, 1)
+
+        self.__memory = None
+        self.__array = None
+        self.__workers = None
+
+    def start(self) -> None:
+        """
+        Start
+
+        Create the shared memory and the worker processes,
+            nothing is created if 'fork' is not available.
+
+        Note:
+            Call it before starting the streams, 'evaluate' calls it 
+            if the workers are not started.
+        """
+
+        if self.__workers is not None:
+            return
+        elif not 'fork' in mp.get_all_start_methods():
+            self.__workers = []
+            return
+
+        shape = (self.size, len(COLUMNS)+1)
+        self.__memory = shared_memory.SharedMemory(
+            create=True, size=int(np.prod(shape))*8)
+        self.__array = np.ndarray(shape, dtype=np.float64, buffer=self.__memory.buf)
+
+        context = mp.get_context('fork')
+        self.__workers = []
+        for i in self.instances:
+            parent, child = context.Pipe()
+            process = context.Process(target=worker, daemon=True,
+                                      args=(i, child, self.__memory.name, shape))
+            process.start()
+            child.close()
+
+            self.__workers.append((process, parent))
+
+    def evaluate(self, data:pd.DataFrame, commission:float = None,
+                 indexes:list = None) -> list:
+        """
+        Evaluate
+
+        Evaluate the strategies with 'data' at the same time
+            and return their actions.
+
+        Note:
+            The account snapshot in '_commons.__snapshot' is sent to
+            the workers, it must be requested before.
+
+        Args:
+            data (pd.DataFrame): Market data.
+            commission (float, optional): Commission by order.
+            indexes (list, optional): Index of the strategies evaluated,
+                if None all of them.
+
+        Returns:
+            list: Actions and error of each strategy of 'indexes'.
+        """
+
+        if self.__workers is None:
+            self.start()
+
+        indexes = range(len(self.instances)) if indexes is None else indexes
+
+        # Without workers.
+        if not self.__workers:
+            result = []
+            for i in indexes:
+                try:
+                    result.append((self.instances[i]._StrategyClassReal__record_before(
+                        data=data, commission=commission), None))
+                except Exception as e:
+                    result.append((None, f"{type(e).__name__}: {e}"))
+            return result
+
+        rows = len(data)
+        if rows <= self.size:
+            self.__array[:rows, 0] = data.index.to_numpy()
+            self.__array[:rows, 1:] = data[list(COLUMNS)].to_numpy()
+            data = None
+
+        # String name, '_commons.__snapshot' would be mangled in the class.
+        snapshot = getattr(_commons, '__snapshot')
+        for i in indexes:
+            self.__workers[i][1].send((rows, data, snapshot, commission))
+
+        return [self.__workers[i][1].recv() for i in indexes]
+
+    def close(self) -> None:
+        """
+        Close
+
+        Finish the worker processes and remove the shared memory.
+        """
+
+        for process, connection in self.__workers or []:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            process.join(timeout=5)
+            if process.is_alive(): process.terminate()
+            connection.close()
+
+        if self.__memory is not None:
+            self.__array = None
+            self.__memory.close()
+            self.__memory.unlink()
+
+        self.__memory = None
+        self.__workers = None
@@ -0,0 +1,127 @@
+"""
+Rounding module.
+
+This module contains the rounding of prices and quantities to the
+    'tickSize' and 'stepSize' of the symbols.
+
+Note:
+    The values are rounded as the decimal number they represent
+    (the shortest 'repr' of the float), so 0.1+0.2 with step 0.1 is 0.3
+    and not 0.30000000000000004, and 1e-05 is not sent in scientific notation.
+
+Functions:
+    step_units: Returns the step as an integer and its power of 10.
+    round_step: Round a scalar to a multiple of the step.
+    round_array: Round a NumPy array to a multiple of the step.
+    format_step: Convert a rounded value to the string sent to Binance.
+"""
+
+from decimal import Decimal, ROUND_FLOOR, ROUND_CEILING, ROUND_HALF_UP
+from functools import lru_cache
+import numpy as np
+
+__modes = {'down': ROUND_FLOOR, 'up': ROUND_CEILING, 'nearest': ROUND_HALF_UP}
+
+@lru_cache(maxsize=None)
+def step_units(step:float) -> tuple:
+    """
+    Step units
+
+    Returns the step as an integer and its power of 10.
+
+    Note:
+        0.001 is (1, 3), 0.5 is (5, 1), 10 is (10, 0).
+
+    Args:
+        step (float): 'tickSize' or 'stepSize'.
+
+    Returns:
+        tuple: step units, decimals.
+    """
+
+    step = Decimal(repr(float(step))).normalize()
+    if step <= 0:
+        raise ValueError("The step must be greater than 0.")
+
+    decimals = max(-step.as_tuple().exponent, 0)
+    return int(step.scaleb(decimals)), decimals
+
+def round_step(value:float, step:float, mode:str = 'down') -> float:
+    """
+    Round step
+
+    Round 'value' to a multiple of 'step'.
+
+    Args:
+        value (float): Value to round.
+        step (float): 'tickSize' or 'stepSize'.
+        mode (str, optional): 'down', 'up' or 'nearest' (half away from zero).
+
+    Returns:
+        float: Rounded value.
+    """
+
+    units, decimals = step_units(step)
+    value = Decimal(repr(float(value))).scaleb(decimals) / units
+
+    return float((value.to_integral_value(rounding=__modes[mode])
+                  * units).scaleb(-decimals))
+
+def round_array(values:np.ndarray, step:float, mode:str = 'down') -> np.ndarray:
+    """
+    Round array
+
+    Round each value of 'values' to a multiple of 'step',
+        the result is the same as 'round_step' for each value.
+
+    Note:
+        The multiple is calculated in float and corrected by comparing it with
+        the next grid value, which is the nearest float to the exact decimal.
+
+    Args:
+        values (np.ndarray): Values to round.
+        step (float): 'tickSize' or 'stepSize'.
+        mode (str, optional): 'down', 'up' or 'nearest' (half away from zero).
+
+    Returns:
+        np.ndarray: Rounded values as float64.
+    """
+
+    if not mode in __modes:
+        raise KeyError(mode)
+
+    units, decimals = step_units(step)
+    scale = 10.0**decimals
+    values = np.asarray(values, dtype=np.float64)
+
+    # Grid index, it can be off by one.
+    n = np.floor(values * scale / units)
+    n += (n+1)*units/scale <= values
+    n -= n*units/scale > values
+
+    if mode == 'up':
+        n += n*units/scale < values
+    elif mode == 'nearest':
+        # Midpoint of the grid as the nearest float of the exact decimal,
+        # half up is away from zero as in 'decimal.ROUND_HALF_UP'.
+        middle = (2*n+1)*units/(2*scale)
+        n += (middle < values) | ((middle == values) & (values >= 0))
+
+    return n*units/scale
+
+def format_step(value:float, step:float) -> str:
+    """
+    Format step
+
+    Convert a value rounded with 'round_step' to a string
+        with the decimals of 'step' without scientific notation.
+
+    Args:
+        value (float): Rounded value.
+        step (float): 'tickSize' or 'stepSize'.
+
+    Returns:
+        str: Value to send.
+    """
+
+    return f"{value:.{step_units(step)[1]}f}"
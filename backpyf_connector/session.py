@@ -0,0 +1,314 @@
+"""
+Session module.
+
+This module contains the trading sessions, each one owns its client, symbol,
+    data and strategies so that several symbols can be traded in the same process.
+
+Note:
+    The sessions share the Binance clients of the same API keys,
+    the HTTP connection pool and the loop of 'run_sessions'.
+
+Classes:
+    Session: Trading session of a symbol.
+
+Functions:
+    activate: Load the state of a session in '_commons'.
+    run_sessions: Execute several sessions in the same loop.
+"""
+
+from datetime import datetime, timedelta
+import time as te
+
+from .parallel import StrategyPool
+from . import tradetools as tools
+from . import exception
+from . import _commons
+from . import main
+
+# '_commons' variables owned by each session.
+STATE = (
+    '__client',
+    '__function',
+    '__symbol',
+    '__interval',
+    '__leverage',
+    '__ps_type',
+    '__data',
+    '__width',
+    '__instances',
+    '__snapshot',
+)
+
+def activate(session) -> None:
+    """
+    Activate
+
+    Load the state of 'session' in '_commons', the state of the
+        previous active session is saved in it.
+
+    Args:
+        session (Session): Session to activate.
+    """
+
+    current = _commons.__session
+    if current is session:
+        return
+    elif not current is None:
+        current.state = {i: getattr(_commons, i) for i in STATE}
+
+    for key, value in session.state.items():
+        setattr(_commons, key, value)
+    _commons.__session = session
+
+class Session:
+    """
+    Session.
+
+    Trading session of a symbol, the strategies of 'cls' are executed with
+        the same rules as 'main.class_group'.
+
+    Attributes:
+        state: Values of the '_commons' variables of 'STATE'
+            while the session is not active.
+        last: Number of candles loaded.
+        time_offset: First close of the day in days.
+        time_less: Seconds before or after the close to execute the strategies.
+        time_close: Interval in days.
+        instances: Instances of the strategies.
+        pool: Worker processes of the strategies, None if they 
+            are executed in the main process.
+
+    Private Attributes:
+        __api_key: Binance API key.
+        __secret_key: Binance API secret key.
+        __test: True if the test orders are used.
+        __processes: True if the strategies are evaluated in worker processes.
+        __cls: Strategies classes.
+        __config: Symbol, interval, leverage and margin type.
+        __num_at: Index of the strategy with an open trade or None.
+
+    Methods:
+        start: Configure the client and the data and create the strategies.
+        tick: Execute the strategies.
+        stop: Finish the worker processes.
+    """
+
+    def __init__(self, api_key:str, secret_key:str, cls:list,
+                 symbol:str, interval:str, leverage:int, ps_type:str,
+                 last:int, time_offset:float = 0, time_less:int = -60,
+                 time_close:float = 1, test:bool = True, 
+                 processes:bool = False) -> None:
+        """
+        __init__
+
+        Builder for initializing the class.
+
+        Args:
+            api_key (str): Binance API key.
+            secret_key (str): Binance API secret key.
+            cls (list): Classes inherited from `StrategyClass` or `StrategyClassReal`.
+            symbol (str): Binance Futures symbol to trade.
+            interval (str): Binance Futures interval.
+            leverage (int): Binance Futures leverage.
+            ps_type (str): Binance Futures margin type.
+            last (int): The number of candles loaded into the strategies.
+            time_offset (float, optional): First close of the day in days.
+            time_less (int, optional): Seconds before (negative) or after
+                (positive) the close to execute the strategies.
+            time_close (float, optional): Interval in days.
+            test (bool, optional): If true, 'client.new_order_test' is used.
+            processes (bool, optional): If true, the strategies are evaluated 
+                at the same time in worker processes, see 'parallel'.
+        """
+
+        self.state = {i: None for i in STATE}
+        self.last = last
+        self.time_offset = time_offset
+        self.time_less = time_less
+        self.time_close = time_close
+        self.instances = []
+        self.pool = None
+
+        self.__processes = processes
+        self.__api_key = api_key
+        self.__secret_key = secret_key
+        self.__test = test
+        self.__cls = cls
+        self.__config = dict(symbol=symbol, interval=interval,
+                             leverage=leverage, ps_type=ps_type)
+        self.__num_at = None
+
+    def start(self) -> None:
+        """
+        Start
+
+        Configure the client and the data and create the strategies.
+        """
+
+        activate(self)
+
+        main.set_client(api_key=self.__api_key, secret_key=self.__secret_key,
+                        test=self.__test)
+        main.set_data(last=self.last, **self.__config)
+
+        self.instances = [main.cls_instance(cls=i) for i in self.__cls]
+
+        if self.__processes:
+            self.stop()
+            self.pool = StrategyPool(self.instances, size=self.last)
+            self.pool.start()
+
+        # String name, '_commons.__instances' would be mangled in the class.
+        setattr(_commons, '__instances', [i.__class__.__name__ for i in self.instances])
+
+        self.__num_at = (0 if not tools.open_trades(symbol=self.__config['symbol']).empty
+                         else None)
+
+    def tick(self, search:bool = True) -> None:
+        """
+        Tick
+
+        Execute the strategies, if one of them has an open trade
+            only that one is executed until the trade is closed.
+
+        Note:
+            The account is read once with 'tools.account_snapshot' and 
+            only read again if a strategy sends an order.
+
+        Args:
+            search (bool, optional): Request the new data before executing.
+        """
+
+        activate(self)
+        symbol = self.__config['symbol']
+
+        if search: main.set_search(last=self.last)
+        tools.account_snapshot(symbol=symbol, refresh=True)
+
+        if self.pool != None:
+            self.__tick_pool(symbol); return
+
+        if self.__num_at != None:
+            main.instance_execute(self.instances[self.__num_at], self.__num_at)
+
+            if tools.account_snapshot(symbol=symbol)['trades'].empty:
+                self.__num_at = None
+            return
+
+        for n, i in enumerate(self.instances):
+            main.instance_execute(i, n+1)
+
+            if not tools.account_snapshot(symbol=symbol)['trades'].empty:
+                self.__num_at = n; break
+
+    def __tick_pool(self, symbol:str) -> None:
+        """
+        Tick pool
+
+        Evaluate the strategies in the worker processes and execute 
+            their actions in the order of the strategies with the same 
+            rule as 'tick', the first strategy with an open trade 
+            is the only one executed until the trade is closed.
+
+        Args:
+            symbol (str): Symbol of the session.
+        """
+
+        indexes = (list(range(len(self.instances))) 
+                   if self.__num_at is None else [self.__num_at])
+        commission = tools.get_commission(symbol=symbol)
+
+        # String name, '_commons.__data' would be mangled in the class.
+        data = getattr(_commons, '__data')
+        results = self.pool.evaluate(data, commission=commission, indexes=indexes)
+
+        for n, (intents, error) in zip(indexes, results):
+            if error != None:
+                raise exception.GenerateError(
+                    f"Strategy '{self.instances[n].__class__.__name__}': {error}")
+
+            self.instances[n]._StrategyClassReal__apply(
+                intents, data=data, commission=commission)
+            if getattr(_commons, '__logs'): main.print_log(f"Executed strategy.'{n+1}'")
+
+            if self.__num_at != None:
+                if tools.account_snapshot(symbol=symbol)['trades'].empty:
+                    self.__num_at = None
+            elif not tools.account_snapshot(symbol=symbol)['trades'].empty:
+                self.__num_at = n; break
+
+    def stop(self) -> None:
+        """
+        Stop
+
+        Finish the worker processes of the strategies.
+        """
+
+        if self.pool != None:
+            self.pool.close()
+            self.pool = None
+
+def run_sessions(sessions:list, time_in:int = 30, wrun:bool = False) -> None:
+    """
+    Run sessions
+
+    Execute several sessions in the same loop, each one
+        at its own close as 'main.generate_loop' does.
+
+    Note:
+        This will be executed in the real market using the Binance API.
+        Before executing this insurance, please refer to 'Risk_notice.txt'.
+
+    Args:
+        sessions (list): Sessions to execute, 'start' is called on each one.
+        time_in (int, optional): The value in seconds indicates how often the
+            loop will run to check whether a session needs to be executed.
+        wrun (bool, optional): Executes the sessions at the start.
+    """
+
+    for i in sessions:
+        i.start()
+        if wrun: i.tick()
+
+    time = datetime.now()
+    run = [True]*len(sessions)
+    history = [{} for _ in sessions]
+    last_cc_bc = time+timedelta(seconds=30)
+    closes = [time.replace(hour=0, minute=0, second=0, microsecond=0)
+              + timedelta(days=i.time_offset) for i in sessions]
+
+    main.print_log('Sistem started.')
+    while _commons.__main_loop:
+        time = datetime.now()
+
+        if time >= last_cc_bc:
+            for n, i in enumerate(sessions):
+                activate(i)
+                run[n] = main.check_connection()
+            last_cc_bc = time + timedelta(seconds=30)
+
+        for n, i in enumerate(sessions):
+            closes[n] = main.calc_close(initial_close=closes[n], time_close=i.time_close)
+            this_less = closes[n]+timedelta(seconds=i.time_less)
+
+            if (time >= min(closes[n], this_less) and
+                time <= max(closes[n], this_less) and
+                not closes[n] in history[n].keys() and run[n]
+                ):
+                try:
+                    calls = _commons.__rest_calls
+                    i.tick()
+                    main.print_log(f"Executed {_commons.__symbol}: {closes[n]}", alert=True)
+                    main.print_calls(calls)
+                    history[n][closes[n]] = True
+                except Exception as e:
+                    main.print_log(f"Error when executing the strategy: {e}", alert=True)
+                    run[n] = main.check_connection()
+
+        te.sleep(time_in)
+
+    for i in sessions:
+        i.stop()
+
+    _commons.__main_loop = True
+    _commons.__instances = None
@@ -0,0 +1,115 @@
+"""
+Store module.
+
+This module contains the local store of closed candles, used to
+    restart without requesting all the data to the Binance API again.
+
+Note:
+    The store is only used if '_commons.__store_dir' is not None.
+    Each symbol and interval is saved in a binary file of float64 rows:
+    timestamp, Close, Open, High, Low, Volume.
+
+Functions:
+    store_path: Returns the file path of the symbol and interval.
+    read_store: Read the saved candles.
+    append_store: Save the new closed candles.
+"""
+
+import pandas as pd
+import numpy as np
+import os
+
+from . import _commons
+from . import clock
+
+__columns = ['Close', 'Open', 'High', 'Low', 'Volume']
+
+def store_path(symbol:str, interval:str) -> str:
+    """
+    Store path
+
+    Returns the file path of the symbol and interval.
+
+    Args:
+        symbol (str): Data symbol.
+        interval (str): Data interval.
+
+    Returns:
+        str: File path.
+    """
+
+    return os.path.join(_commons.__store_dir, f"{symbol}_{interval}.dat")
+
+def read_store(symbol:str, interval:str, last:int = None) -> pd.DataFrame:
+    """
+    Read store
+
+    Read the saved candles, the file is memory-mapped so only
+        the last 'last' candles are read.
+
+    Args:
+        symbol (str): Data symbol.
+        interval (str): Data interval.
+        last (int, optional): Number of steps to return starting from
+            the last saved, if None all are returned.
+
+    Returns:
+        pd.DataFrame: Saved candles, empty if there are none.
+    """
+
+    path = store_path(symbol, interval)
+    rows = os.path.getsize(path)//48 if os.path.exists(path) else 0
+
+    if rows == 0:
+        return pd.DataFrame(columns=__columns,
+                            index=pd.Index([], dtype='int64', name='timestamp'))
+
+    # Incomplete last row (interrupted write) is ignored.
+    data = np.memmap(path, dtype='<f8', mode='r', shape=(rows, 6))
+    data = np.array(data[-last:] if last else data)
+
+    return pd.DataFrame(data[:, 1:], columns=__columns,
+                        index=pd.Index(data[:, 0].astype('int64'), name='timestamp'))
+
+def append_store(symbol:str, interval:str, data:pd.DataFrame,
+                 step:int) -> None:
+    """
+    Append store
+
+    Save the closed candles of 'data' that are newer than the last saved.
+
+    Note:
+        If there is a gap between the saved candles and 'data',
+        the file is rewritten with 'data' so that it is always continuous.
+        The closed candles are decided with 'clock.timestamp'.
+
+    Args:
+        symbol (str): Data symbol.
+        interval (str): Data interval.
+        data (pd.DataFrame): Candles returned by 'tradetools.fetch_data'.
+        step (int): Interval duration in milliseconds.
+    """
+
+    # Only closed candles, by the time of the Binance server.
+    data = data[data.index + step <= clock.timestamp()]
+
+    last = read_store(symbol, interval, last=1)
+    mode = 'ab'
+    if not last.empty:
+        data = data[data.index > last.index[-1]]
+        if not data.empty and data.index[0] != last.index[-1] + step:
+            mode = 'wb'
+
+    if data.empty:
+        return
+
+    path = store_path(symbol, interval)
+    os.makedirs(_commons.__store_dir, exist_ok=True)
+
+    # Remove the incomplete last row of an interrupted write.
+    if mode == 'ab' and os.path.exists(path) and os.path.getsize(path) % 48:
+        os.truncate(path, os.path.getsize(path)//48*48)
+
+    with open(path, mode) as file:
+        np.column_stack([data.index.to_numpy(dtype='<f8'),
+                         data[__columns].to_numpy(dtype='<f8')]).tofile(file)
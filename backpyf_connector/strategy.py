@@ -5,6 +5,12 @@ This module contains the strategy you need to inherit to connect your strategy t
 
 Classes:
     StrategyClassReal: Inherit this class to keep documentation and features up to date.
+
+Functions:
+    incremental: Give an indicator the function that calculates only the new steps.
+    data_version: Returns the version of the data.
+    idc_result: Returns the result of an indicator, calculated once by data version.
+    shared_result: Returns a shared indicator result that can be given to a strategy.
 """
 
 import backpyf.exception as exception
@@ -13,11 +19,158 @@ import backpyf as bk
 
 from backpyf.main import flx
 
+from inspect import signature
 import numpy as np
 import pandas as pd
 
+from .buffer import DataBuffer
 from . import tradetools as tools
 
+# Indicator results of the current data version and 
+# last result of each incremental indicator.
+__idc = {'data': None, 'version': 0, 'cache': {}, 'state': {}}
+
+def incremental(update:callable) -> callable:
+    """
+    Incremental
+
+    Give the indicator the function 'update' that calculates only the new steps, 
+        the indicator is calculated complete only the first time or after a gap.
+
+    Note:
+        'update' receives: data, the previous result as an array aligned 
+        with the previous data without its last step, the number of new 
+        steps and the indicator arguments. It returns the values of the 
+        new steps. The last step of the previous data is one of the new 
+        steps because it could be open and have changed.
+        The result of the indicator is returned as an array.
+
+    Usage:
+        @idc_decorator
+        @incremental(lambda data, prev, new: data['Close'].iloc[-new:])
+        def idc_test(data):
+            return data['Close']
+
+    Args:
+        update (callable): Function that calculates the new steps.
+
+    Returns:
+        callable: Decorator.
+    """
+
+    def decorator(func:callable) -> callable:
+        func._update = update
+        return func
+    return decorator
+
+def data_version(data:pd.DataFrame) -> int:
+    """
+    Data version
+
+    Returns the version of 'data', it changes when the data is another DataFrame.
+
+    Args:
+        data (pd.DataFrame): Data of the strategies.
+
+    Returns:
+        int: Version.
+    """
+
+    if not data is __idc['data']:
+        __idc['data'] = data
+        __idc['version'] += 1
+        __idc['cache'] = {}
+
+    return __idc['version']
+
+def idc_result(func:callable, data:pd.DataFrame, version:int, 
+               key:str, *args, **kwargs):
+    """
+    Indicator result
+
+    Returns the result of the indicator 'func', it is calculated once by 
+        data version and arguments and shared by all the strategies.
+
+    Note:
+        If 'func' is 'incremental' only the new steps since its last 
+        result are calculated. If the arguments are not hashable the 
+        result is not saved. The default arguments are part of the key.
+        The results are shared, the arrays are returned read only 
+        and the other results are copied.
+
+    Args:
+        func (callable): Indicator function.
+        data (pd.DataFrame): Data sent to the indicator.
+        version (int): Version of 'data' from 'data_version'.
+        key (str): Data key, for example the symbol.
+        *args: Indicator arguments.
+        **kwargs: Indicator keyword arguments.
+
+    Returns:
+        Result of the indicator.
+    """
+
+    try:
+        arguments = signature(func).bind(data, *args, **kwargs)
+        arguments.apply_defaults()
+
+        id = (func, key, tuple(arguments.arguments.items())[1:])
+        hash(id)
+    except TypeError:
+        return func(data, *args, **kwargs)
+
+    # Results of an old version are not saved.
+    cache = __idc['cache'] if version == __idc['version'] else {}
+    if id in cache:
+        return shared_result(cache[id])
+
+    update = getattr(func, '_update', None)
+    index = data.index.to_numpy()
+    result = None
+
+    if update and id in __idc['state']:
+        last_index, last = __idc['state'][id]
+
+        # The previous last step could be open, it is calculated again.
+        keep = np.searchsorted(index, last_index[-1])
+
+        # The old steps are the same, only the new ones are calculated.
+        if (0 < keep < len(index) and keep < len(last) and 
+            np.array_equal(index[:keep+1], last_index[len(last_index)-keep-1:])):
+            new = len(index) - keep
+
+            result = np.concatenate([last[len(last)-keep-1:-1], np.asarray(
+                update(data, last[:-1], new, *args, **kwargs))[-new:]])
+
+    if result is None:
+        result = func(data, *args, **kwargs)
+    if update:
+        result = np.asarray(result)
+        __idc['state'][id] = (index, result)
+
+    cache[id] = result
+    return shared_result(result)
+
+def shared_result(result):
+    """
+    Shared result
+
+    Returns a result of 'idc_result' that can be given to a strategy, 
+        the arrays are made read only and the other results are copied.
+
+    Args:
+        result: Indicator result.
+
+    Returns:
+        Result.
+    """
+
+    if isinstance(result, np.ndarray):
+        result.flags.writeable = False
+        return result
+
+    return result.copy() if hasattr(result, 'copy') else result
+
 class StrategyClassReal(bk.StrategyClass):
     """
     StrategyClassReal.
@@ -40,7 +193,13 @@ class StrategyClassReal(bk.StrategyClass):
 
     Private Attributes:
         __data_icon: Data icon from `__symbol`.
-        __data: DataFrame containing all data of steps.
+        __data_version: Version of '__data_all' from 'data_version'.
+        __data: DataFrame containing all data of steps, it is 
+            created from '__buffer' only when it is used.
+        __buffer: NumPy buffer of the last steps by column.
+        __frame: DataFrame of '__data', None if it has to be created.
+        __record: Actions saved instead of executed, None if 
+            the actions are executed.
         __data_all: DataFrame containing all data of steps.
         __commission: Commission by order.
         __init_funds: Account balance.
@@ -59,10 +218,15 @@ class StrategyClassReal(bk.StrategyClass):
         prev: Recovers all step data.
 
     Private Methods:
+        __prepare: Install the wrappers of the '_store' and '_uidc' methods once by class.
         __uidc: Send data argument to the indicator.
         __store_decorator: Cut the data with the 'last' argument.
         __act_close: Closes an existing trade.
         __before: This function is used to run trades and other operations.
+        __intent: Save the action instead of executing it.
+        __record_before: Run '__before' saving the actions.
+        __apply: Execute the saved actions.
+        __protective_ids: Returns the ids of the protective orders of a trade.
         __trades_ac_get: This function sets the 
             variable '__trades_ac' if it is None.
         __trades_cl_get: This function sets the 
@@ -95,7 +259,10 @@ class StrategyClassReal(bk.StrategyClass):
         self.date = None
 
         self.__data_icon = symbol
-        self._StrategyClass__data = pd.DataFrame()
+        self.__data_version = None
+        self.__record = None
+        self.__buffer = DataBuffer()
+        self.__frame = None
 
         self._StrategyClass__data_all = None
 
@@ -109,19 +276,59 @@ class StrategyClassReal(bk.StrategyClass):
         self.width = width
         self.icon = symbol
 
+        self.__prepare()
+
+    @property
+    def _StrategyClass__data(self) -> pd.DataFrame:
+        """
+        Data
+
+        DataFrame of the steps, it is created from '__buffer' 
+            the first time it is used after each update.
+
+        Return:
+            pd.DataFrame: Data.
+        """
+
+        if self.__frame is None:
+            self.__frame = self.__buffer.frame()
+        return self.__frame
+
+    @_StrategyClass__data.setter
+    def _StrategyClass__data(self, data:pd.DataFrame) -> None:
+        self.__buffer.update(data)
+        self.__frame = None
+
+    @classmethod
+    def __prepare(cls) -> None:
+        """
+        Prepare
+
+        Install in 'cls' the wrappers of the '_store' and '_uidc' methods, 
+            it is done once by class so the instances only bind them.
+        """
+
+        if cls.__dict__.get('_StrategyClassReal__prepared', False):
+            return
+
         for name, attr in bk.StrategyClass.__dict__.items():
-            if callable(attr) and getattr(attr, "_store", False):
-                do = getattr(self, "_StrategyClassReal__store_decorator", None)
-                setattr(self, name, do(attr))
+            # The methods redefined here already use the buffer.
+            if (callable(attr) and getattr(attr, "_store", False) and 
+                not name in StrategyClassReal.__dict__ and
+                not getattr(getattr(cls, name, None), "_real", False)):
+                setattr(cls, name, StrategyClassReal.__store_decorator(attr))
+
+        for name in dir(cls):
+            attr = getattr(cls, name, None)
 
-        for name in dir(self):
-            attr = getattr(self, name)
+            if (callable(attr) and getattr(attr, "_uidc", False) and 
+                not getattr(attr, "_real", False)):
+                setattr(cls, name, StrategyClassReal.__uidc(attr))
 
-            if callable(attr) and getattr(attr, "_uidc", False):
-                do = getattr(self, "_StrategyClassReal__uidc", None)
-                setattr(self, name, do(attr))
+        cls.__prepared = True
 
-    def __uidc(self, func:callable) -> callable:
+    @staticmethod
+    def __uidc(func:callable) -> callable:
         """
         User indicator
 
@@ -131,32 +338,37 @@ class StrategyClassReal(bk.StrategyClass):
             func (callable): Function.
 
         Return:
-            callable: Wrapper function.
+            callable: Wrapper method.
         """
 
-        func = staticmethod(func).__func__
+        func = getattr(func, '__func__', func)
 
         @bk.strategy.wraps(func)
-        def __wr_func(*args, **kwargs) -> flx.DataWrapper:
+        def __wr_func(self, *args, **kwargs) -> flx.DataWrapper:
             """
             Wrapper function
 
-            Sends '__data_all' to the 'data' argument.
+            Sends '__data_all' to the 'data' argument, the result 
+                is calculated once by data version with 'idc_result'.
 
             Return:
                 DataWrapper: Function result.
             """
 
-            result = bk.DataWrapper(func.__func__(
-                self._StrategyClass__data_all, *args, **kwargs))
+            result = bk.DataWrapper(idc_result(
+                func, self._StrategyClass__data_all, 
+                self.__data_version, self.__data_icon, *args, **kwargs))
 
             if len(result) != len(self._StrategyClass__data_all):
                 raise bk.strategy.exception.UidcError('Length different from data.')
 
             return result
+
+        __wr_func._real = True
         return __wr_func
 
-    def __store_decorator(self, func:callable) -> callable:
+    @staticmethod
+    def __store_decorator(func:callable) -> callable:
         """
         Data store
 
@@ -166,10 +378,10 @@ class StrategyClassReal(bk.StrategyClass):
             func (callable): Function.
 
         Return:
-            callable: Wrapper function.
+            callable: Wrapper method.
         """
 
-        def __wr_func(*args, **kwargs) -> pd.DataFrame:
+        def __wr_func(self, *args, **kwargs) -> pd.DataFrame:
             """
             Wrapper function
 
@@ -194,6 +406,8 @@ class StrategyClassReal(bk.StrategyClass):
                         else result)
 
             return result
+
+        __wr_func._real = True
         return __wr_func
 
     def get_init_funds(self) -> None:
@@ -207,10 +421,14 @@ class StrategyClassReal(bk.StrategyClass):
         Get active trades
 
         This function sets the variable '__trades_ac' if it is None.
+
+        Note:
+            The trades are taken from 'tools.account_snapshot'.
         """
 
         if self._StrategyClass__trades_ac is None:
-            self._StrategyClass__trades_ac = tools.open_trades(symbol=self.__data_icon)
+            self._StrategyClass__trades_ac = tools.account_snapshot(
+                symbol=self.__data_icon)['trades']
 
     def __trades_cl_get(self) -> None:
         """
@@ -227,10 +445,14 @@ class StrategyClassReal(bk.StrategyClass):
         Get funds
 
         This function sets the variable '__init_funds' if it is None.
+
+        Note:
+            The balance is taken from 'tools.account_snapshot'.
         """
 
         if self._StrategyClass__init_funds is None:
-            self._StrategyClass__init_funds = tools.get_balance()
+            self._StrategyClass__init_funds = tools.account_snapshot(
+                symbol=self.__data_icon)['balance']
 
     def __trades_updater(self, commission:float = None) -> None:
         """
@@ -262,15 +484,16 @@ class StrategyClassReal(bk.StrategyClass):
         if data.empty:
             raise exception.StyClassError('Data is empty.')
 
-        self.open = data["Open"].iloc[-1]
-        self.high = data["High"].iloc[-1]
-        self.low = data["Low"].iloc[-1]
-        self.close = data["Close"].iloc[-1]
-        self.volume = data["Volume"].iloc[-1]
-        self.date = data.index[-1]+self.width
-
         self._StrategyClass__data = self._StrategyClass__data_all = data
 
+        self.open = self.__buffer.last("Open")
+        self.high = self.__buffer.last("High")
+        self.low = self.__buffer.last("Low")
+        self.close = self.__buffer.last("Close")
+        self.volume = self.__buffer.last("Volume")
+        self.date = self.__buffer.last("index")+self.width
+        self.__data_version = data_version(data)
+
     def __before(self, data = pd.DataFrame(), commission:float = None) -> None:
         """
         Before
@@ -288,16 +511,86 @@ class StrategyClassReal(bk.StrategyClass):
 
         self.next()
 
+    def __intent(self, action:str, **kwargs) -> bool:
+        """
+        Intent
+
+        Save the action in '__record' instead of executing it, 
+            used when the strategy is evaluated in a worker process.
+
+        Args:
+            action (str): Name of the action method.
+            **kwargs: Action arguments.
+
+        Return:
+            bool: True if the action was saved.
+        """
+
+        if self.__record is None:
+            return False
+
+        self.__record.append((action, kwargs))
+        return True
+
+    def __record_before(self, data = pd.DataFrame(), 
+                        commission:float = None) -> list:
+        """
+        Record before
+
+        Run '__before' saving the actions instead of executing them.
+
+        Args:
+            data (pd.DataFrame): Data from the current and previous steps.
+            commission (float, optional): Commission by order.
+
+        Return:
+            list: Actions as tuples of name and arguments.
+        """
+
+        self.__record = []
+        try:
+            self.__before(data=data, commission=commission)
+            return self.__record
+        finally:
+            self.__record = None
+
+    def __apply(self, intents:list, data = pd.DataFrame(), 
+                commission:float = None) -> list:
+        """
+        Apply
+
+        Execute the actions saved by '__record_before' in their order 
+            without running the strategy.
+
+        Args:
+            intents (list): Actions as tuples of name and arguments.
+            data (pd.DataFrame): Data from the current and previous steps.
+            commission (float, optional): Commission by order.
+
+        Return:
+            list: Result of each action.
+        """
+
+        if not data.empty:
+            self.__data_updater(data=data)
+            self.__trades_updater(commission=commission)
+
+        return [getattr(self, action)(**kwargs) for action, kwargs in intents]
+
     def prev(self, label:str = None, last:int = None) -> flx.DataWrapper:
         """
         Prev
 
         This function returns the values of `data`.
+
+        Note:
+            A column is returned as a read only view of '__buffer' without 
+            copying it, it is only valid for the current step because 
+            it changes when the next step is loaded, copy it to keep it.
         
         Args:
             label (str, optional): Data column to return. If None, all columns 
-                are returned. If 'index', only indexes are returned, ignoring 
-                the `last` parameter.
+                are returned. If 'index', only indexes are returned.
             last (int, optional): Number of steps to return starting from the 
                 present. If None, data for all times is returned.
 
@@ -314,7 +607,17 @@ class StrategyClassReal(bk.StrategyClass):
             DataWrapper: DataWrapper containing the data of previous steps.
         """
 
-        return super().prev(label=label, last=last)
+        if label is None:
+            return super().prev(label=label, last=last)
+
+        if (last != None and 
+              (last <= 0 or last > len(self.__buffer))): 
+            raise ValueError(utils.text_fix("""
+                            Last has to be less than the length of 
+                            'data' and greater than 0.
+                            """, newline_exclude=True))
+
+        return flx.DataWrapper(self.__buffer.view(label, last), columns=label)
 
     def prev_orders(self, id:int = None, type_:str = None, 
                     label:str = None, last:int = None) -> flx.DataWrapper:
@@ -349,14 +652,15 @@ class StrategyClassReal(bk.StrategyClass):
             DataWrapper: DataWrapper containing the data of orders.
         """
 
-        __orders = tools.open_orders(symbol=self.__data_icon, id=id)
+        __orders = tools.format_orders(tools.account_snapshot(
+            symbol=self.__data_icon)['orders'], id=id)
         if label == 'index': 
             return flx.DataWrapper(__orders.index, columns='index')
         elif __orders.empty: 
             return flx.DataWrapper()
 
         if (last != None and 
-              (last <= 0 or last > self.__data["Close"].shape[0])): 
+              (last <= 0 or last > len(self.__buffer))): 
             raise ValueError(utils.text_fix("""
                             Last has to be less than the length of 
                             'data' and greater than 0.
@@ -452,6 +756,9 @@ class StrategyClassReal(bk.StrategyClass):
         Note:
             If you leave your position without 'stop loss' and 'takeprofit', 
             your trade will be counted as closed, and you can't modify or close it.
+            The 'stop loss' and 'takeprofit' are sent together right after the entry, 
+            if one of them is rejected it is alerted with 'main.print_log' and 
+            its result has the 'code' of the error.
 
         Args:
             type (bool): 0 for sell, 1 for buy. Other values Python evaluates 
@@ -463,9 +770,14 @@ class StrategyClassReal(bk.StrategyClass):
             amount (int): Amount of points for the trade.
 
         Return:
-            tuple: order, stop order, take profit order
+            tuple: order, stop order, take profit order, 
+                all None if the action is saved in a worker process.
         """
 
+        if self.__intent('act_open', type=type, stop_loss=stop_loss, 
+                         take_profit=take_profit, amount=amount):
+            return None, None, None
+
         # Convert to boolean.
         type = int(bool(type))
 
@@ -479,10 +791,10 @@ class StrategyClassReal(bk.StrategyClass):
         elif amount < 0: 
             raise exception.ActionError(
                 "'amount' can only be a positive number.")
-        elif ((type and (self._StrategyClass__data["Close"].iloc[-1] <= stop_loss or 
-                       self._StrategyClass__data["Close"].iloc[-1] >= take_profit)) or 
-            (not type and (self._StrategyClass__data["Close"].iloc[-1] >= stop_loss or 
-                           self._StrategyClass__data["Close"].iloc[-1] <= take_profit))): 
+        elif ((type and (self.close <= stop_loss or 
+                       self.close >= take_profit)) or 
+            (not type and (self.close >= stop_loss or 
+                           self.close <= take_profit))): 
 
             raise exception.ActionError(
                 utils.text_fix("""
@@ -500,6 +812,16 @@ class StrategyClassReal(bk.StrategyClass):
         if not order_:
             raise exception.ActionError("Position not active.")
 
+        # The position is open, a rejected protective order is only alerted.
+        for name, leg in (('Stop loss', order_stop), ('Take profit', order_take)):
+            if isinstance(leg, dict) and 'code' in leg:
+                from .main import print_log
+
+                print_log(utils.text_fix(f"""
+                          ⚠️ {name} order of {self.__data_icon} rejected, 
+                          the position is open without it: {leg.get('msg')}
+                          """, newline_exclude=True), alert=True)
+
         self.__trades_updater()
         return order_, order_stop, order_take
     
@@ -511,9 +833,13 @@ class StrategyClassReal(bk.StrategyClass):
             index (int): The index of the active trade you want to close.
 
         Return:
-            tuple: order, stop order, take profit order
+            tuple: order, stop order, take profit order, 
+                all None if the action is saved in a worker process.
         """
 
+        if self.__intent('act_close', index=index):
+            return None, None, None
+
         # Set __trades_ac.
         self.__trades_ac_get()
 
@@ -545,23 +871,40 @@ class StrategyClassReal(bk.StrategyClass):
         order_, order_stop, order_take = tools.place_order(
             symbol=self.__data_icon, 
             side='SELL' if trade['Type'] else 'BUY', 
-            quantity=trade['positionAmt']
+            quantity=abs(trade['positionAmt'])
             )
-        
-        orders = tools.open_orders(symbol=self.__data_icon, id=trade['id'])
-
-        if not orders['orderId'].empty:
-            orders.apply(lambda x: tools.cancel_order(self.__data_icon,x['orderId']) 
-                         if x['symbol'] == 'BTCUSDT' and 
-                         x['type'] in ('STOP_MARKET','TAKE_PROFIT_MARKET') 
-                         else None, axis=1)
 
         if not order_:
             raise exception.ActionError("Position not active.")
 
+        # The protective orders are canceled only after the position is closed.
+        tools.cancel_orders(symbol=self.__data_icon, ids=self.__protective_ids(
+            trade, ('STOP_MARKET','TAKE_PROFIT_MARKET')))
+
         self.__trades_updater()
         return order_, order_stop, order_take
 
+    def __protective_ids(self, trade:pd.Series, types) -> list:
+        """
+        Protective ids
+
+        Returns the ids of the open orders of 'types' that close 'trade', 
+            the orders of its symbol with the opposite side and its position side.
+
+        Args:
+            trade (pd.Series): Active trade.
+            types: Order types.
+
+        Return:
+            list: Orders ids.
+        """
+
+        return [i['orderId'] for type_ in types
+                for i in tools.find_orders(
+                    self.__data_icon, type_, 
+                    side='SELL' if trade['Type'] else 'BUY', 
+                    position_side=trade.get('positionSide', 'BOTH'))]
+
     def act_mod(self, index:int = 0, new_stop:int = None, 
                 new_take:int = None) -> tuple:
         """
@@ -579,9 +922,14 @@ class StrategyClassReal(bk.StrategyClass):
                 will not be modified. If np.nan, take profit will be removed.
 
         Return:
-            tuple: stop order, take profit order
+            tuple: stop order, take profit order, 
+                all None if the action is saved in a worker process.
         """
 
+        if self.__intent('act_mod', index=index, new_stop=new_stop, 
+                         new_take=new_take):
+            return None, None
+
         # Set __trades_ac.
         self.__trades_ac_get()
 
@@ -592,45 +940,36 @@ class StrategyClassReal(bk.StrategyClass):
             raise exception.ActionError('Nothing was changed.')
         # Get trade to modify.
         trade = self._StrategyClass__trades_ac.loc[index]
+        legs = {}
+
         # Set new stop.
-        order_stop = 0
-        if new_stop and ((new_stop < self._StrategyClass__data["Close"].iloc[-1] and 
+        if new_stop and ((new_stop < self.close and 
                           trade['Type']) or (not trade['Type'] and 
                                              new_stop > self.close) or 
                                              np.isnan(new_stop)): 
-            old_order = tools.open_orders(symbol=self.__data_icon, id=trade['id'])
-            old_order = old_order[old_order['type'] == 'STOP_MARKET']
-
-            if not old_order.empty:
-                tools.cancel_order(symbol=self.__data_icon, id=old_order.iloc[-1]['orderId'])
-
-            order_stop = tools.create_order(
-                symbol=self.__data_icon,
-                side='SELL' if trade['side'] == 'BUY' else 'BUY',
-                quantity=trade['positionAmt'],
-                price=new_stop,
-                type_='STOP_MARKET'
-            )
+            legs['STOP_MARKET'] = new_stop
 
         # Set new take.
-        order_take = 0
-        if new_take and ((new_take > self._StrategyClass__data["Close"].iloc[-1] 
+        if new_take and ((new_take > self.close 
                           and trade['Type']) or (not trade['Type'] and 
                                                  new_take < self.close) or 
                                                  np.isnan(new_take)): 
-            old_order = tools.open_orders(symbol=self.__data_icon, id=trade['id'])
-            old_order = old_order[old_order['type'] == 'TAKE_PROFIT_MARKET']
-
-            if not old_order.empty:
-                tools.cancel_order(symbol=self.__data_icon, id=old_order.iloc[-1]['orderId'])
-
-            order_take = tools.create_order(
-                symbol=self.__data_icon,
-                side='SELL' if trade['side'] == 'BUY' else 'BUY',
-                quantity=trade['positionAmt'],
-                price=new_take,
-                type='TAKE_PROFIT_MARKET'
-            )
+            legs['TAKE_PROFIT_MARKET'] = new_take
+
+        # Old orders are canceled first, Binance only accepts 
+        # one 'closePosition' order of each type.
+        tools.cancel_orders(symbol=self.__data_icon, 
+                            ids=self.__protective_ids(trade, legs))
+
+        legs = {type_: price for type_, price in legs.items() if not np.isnan(price)}
+        orders = dict(zip(legs.keys(), tools.create_orders(
+            symbol=self.__data_icon,
+            orders=[dict(side='SELL' if trade['Type'] else 'BUY',
+                         quantity=abs(trade['positionAmt']), price=price, type_=type_)
+                    for type_, price in legs.items()])))
+
+        order_stop = orders.get('STOP_MARKET', 0)
+        order_take = orders.get('TAKE_PROFIT_MARKET', 0)
         
         self.__trades_updater()
         return order_stop, order_take
@@ -0,0 +1,456 @@
+"""
+Stream module.
+
+This module contains the Binance Futures WebSocket streams used
+    to execute the strategies as soon as each candle closes.
+
+Functions:
+    push_kline: Add a closed candle to '_commons.__data'.
+    kline_stream: Subscribe to the kline stream and execute a function on every closed candle.
+    stop_stream: Close the kline stream.
+    sync_book: Request the orders, positions and fills of a symbol for the book.
+    update_book: Update the book with a user data stream message.
+    apply_book: Apply a user data stream message to a book.
+    user_stream: Subscribe to the user data stream and keep the book updated.
+    stop_user_stream: Close the user data stream.
+"""
+
+from binance.websocket.um_futures.websocket_client import UMFuturesWebsocketClient
+from threading import Thread, Lock, RLock
+import pandas as pd
+import time as te
+import json
+
+from . import tradetools as tools
+from . import _commons
+from . import clock
+from . import store
+from . import main
+
+__lock = Lock()
+__book_lock = RLock()
+
+def push_kline(kline:dict, last:int) -> None:
+    """
+    Push kline
+
+    Add a closed candle from the kline stream to '_commons.__data'.
+
+    Note:
+        If there are candles missing between '_commons.__data' and 'kline'
+        they are requested with 'main.set_search'.
+        If '_commons.__store_dir' is not None, the candle is saved in the store.
+
+    Args:
+        kline (dict): 'k' value of the kline stream message.
+        last (int): Number of candles kept in '_commons.__data'.
+    """
+
+    data = _commons.__data
+
+    # Gap: candles between the cached data and this one are missing.
+    if data is None or data.index[-1] < kline['t'] - _commons.__width:
+        main.set_search(last=last)
+        data = _commons.__data
+
+    candle = pd.DataFrame(
+        [[float(kline['c']), float(kline['o']), float(kline['h']),
+          float(kline['l']), float(kline['v'])]],
+        index=pd.Index([kline['t']], name='timestamp'),
+        columns=['Close', 'Open', 'High', 'Low', 'Volume'])
+
+    _commons.__data = pd.concat([data[data.index < kline['t']], candle]).iloc[-last:]
+
+    if _commons.__store_dir:
+        store.append_store(_commons.__symbol, _commons.__interval, candle, 
+                           step=tools.interval_ms(_commons.__interval))
+
+def kline_stream(function:callable, last:int,
+                 stream_url:str = "wss://fstream.binance.com",
+                 reconnect:float = 5) -> None:
+    """
+    Kline stream
+
+    Subscribe to the kline stream of '_commons.__symbol' and every time
+        a candle closes update '_commons.__data' and execute 'function'.
+
+    Note:
+        If the connection is lost it reconnects automatically every 'reconnect'
+        seconds, the candles lost in the meantime are requested with 'main.set_search'.
+        The previous client is stopped on each reconnection and only one 
+        reconnect loop runs at a time, 'function' is executed once by candle
+        and the messages of the previous clients are ignored.
+        The seconds between the candle close and the execution of 'function'
+        are saved in '_commons.__stream_latency'.
+
+    Args:
+        function (callable): Function executed on every closed candle.
+        last (int): Number of candles kept in '_commons.__data'.
+        stream_url (str, optional): WebSocket server url.
+        reconnect (float, optional): Seconds to wait before reconnecting.
+    """
+
+    executed = None
+
+    def on_message(manager, message:str) -> None:
+        nonlocal executed
+
+        message = json.loads(message)
+        if (message.get('e') != 'kline' or not message['k']['x'] 
+            or not current(manager)):
+            return
+
+        kline = message['k']
+        with __lock:
+            # Each candle is executed once, the messages can be repeated.
+            if not executed is None and kline['t'] <= executed:
+                return
+            executed = kline['t']
+
+            push_kline(kline, last=last)
+
+        _commons.__stream_latency = te.time() - (kline['T']+1)/1000
+        try:
+            calls = _commons.__rest_calls
+            function()
+            main.print_log(f"Executed: {pd.to_datetime(kline['T']+1, unit='ms')}", alert=True)
+            main.print_calls(calls)
+        except Exception as e:
+            main.print_log(f"Error when executing the strategy: {e}", alert=True)
+
+    reconnecting = False
+
+    def current(manager) -> bool:
+        # The callbacks of the replaced clients are ignored.
+        stream = _commons.__stream
+        return not stream is None and getattr(stream, 'socket_manager', None) is manager
+
+    def on_close(manager, *_) -> None:
+        if current(manager):
+            start_reconnect()
+
+    def on_error(manager, error) -> None:
+        main.print_log(f"Stream error: {error}", alert=True)
+
+        # The errors of the callbacks keep the connection open.
+        if current(manager) and not getattr(getattr(manager, 'ws', None), 'connected', False):
+            start_reconnect()
+
+    def start_reconnect() -> None:
+        nonlocal reconnecting
+
+        # Only one reconnect loop at a time.
+        with __lock:
+            if reconnecting:
+                return
+            reconnecting = True
+
+        main.print_log('⚠️ Stream connection lost.', alert=True)
+        Thread(target=reconnect_loop, daemon=True).start()
+
+    def reconnect_loop() -> None:
+        nonlocal reconnecting
+
+        try:
+            while not _commons.__stream is None:
+                te.sleep(reconnect)
+                try:
+                    connect()
+                    main.print_log('Stream reconnected.')
+                    return
+                except Exception as e:
+                    main.print_log(f"Error when reconnecting the stream: {e}", alert=True)
+        finally:
+            with __lock:
+                reconnecting = False
+
+    def connect() -> None:
+        old = _commons.__stream
+
+        _commons.__stream = UMFuturesWebsocketClient(
+            stream_url=stream_url, on_message=on_message,
+            on_close=on_close, on_error=on_error)
+        _commons.__stream.kline(symbol=_commons.__symbol,
+                                interval=_commons.__interval)
+
+        if not old is None:
+            Thread(target=old.stop, daemon=True).start()
+
+        # Backfill the candles lost while it was not connected.
+        with __lock:
+            main.set_search(last=last)
+
+    connect()
+
+def stop_stream() -> None:
+    """
+    Stop stream
+
+    Close the kline stream.
+    """
+
+    stream, _commons.__stream = _commons.__stream, None
+    if not stream is None:
+        stream.stop()
+
+def sync_book(symbol:str) -> None:
+    """
+    Sync book
+
+    Request the open orders, positions and last fills of 'symbol' 
+        to the Binance API and save them in '_commons.__book'.
+
+    Note:
+        The stream messages of 'symbol' that arrive during the requests 
+        are saved in 'pending' of the book, the ones newer than the start 
+        of the requests are applied after saving the response.
+
+    Args:
+        symbol (str): Symbol to sync.
+    """
+
+    book = _commons.__book
+    with __book_lock:
+        book['pending'][symbol] = []
+
+    try:
+        start = clock.timestamp()
+        orders, positions, fills = tools.run_concurrent([
+            lambda: _commons.__client.get_orders(symbol=symbol, recvWindow=_commons.__recvWindow),
+            lambda: _commons.__client.get_position_risk(symbol=symbol, recvWindow=_commons.__recvWindow),
+            lambda: _commons.__client.get_account_trades(symbol=symbol, limit=10, 
+                                                         recvWindow=_commons.__recvWindow),
+        ])
+    except Exception:
+        with __book_lock:
+            book['pending'].pop(symbol, None)
+        raise
+
+    with __book_lock:
+        book['orders'][symbol] = {i['orderId']: i for i in orders}
+        book['positions'][symbol] = {i['positionSide']: i for i in positions}
+        book['fills'][symbol] = [{'time': i['time'], 'id': i['id'], 'side': i['side']} 
+                                 for i in fills[::-1]]
+        book['symbols'].add(symbol)
+
+        # The messages already in the response are applied again, 
+        # the orders and positions are replaced and the fills are not repeated.
+        for i in book['pending'].pop(symbol):
+            if i.get('T', i.get('E', 0)) >= start:
+                apply_book(book, i)
+
+def update_book(message:dict) -> None:
+    """
+    Update book
+
+    Update '_commons.__book' with a user data stream message.
+
+    Note:
+        The dictionaries are replaced instead of modified 
+        so they can be read from other threads.
+        While a symbol is synchronized with 'sync_book' its 
+        messages are saved in 'pending' instead of applied.
+
+    Args:
+        message (dict): 'ORDER_TRADE_UPDATE' or 'ACCOUNT_UPDATE' message.
+    """
+
+    book = _commons.__book
+
+    if book is None:
+        return
+
+    with __book_lock:
+        apply_book(book, message)
+
+def apply_book(book:dict, message:dict) -> None:
+    """
+    Apply book
+
+    Apply a user data stream message to 'book', 
+        use 'update_book' from other modules.
+
+    Args:
+        book (dict): Book of '_commons.__book'.
+        message (dict): 'ORDER_TRADE_UPDATE' or 'ACCOUNT_UPDATE' message.
+    """
+
+    if message.get('e') == 'ORDER_TRADE_UPDATE':
+        order = message['o']
+        symbol = order['s']
+        if symbol in book['pending']:
+            book['pending'][symbol].append(message); return
+        elif not symbol in book['symbols']:
+            return
+
+        orders = dict(book['orders'][symbol])
+        if order['X'] in ('NEW', 'PARTIALLY_FILLED'):
+            orders[order['i']] = {
+                'orderId': order['i'],
+                'symbol': symbol,
+                'status': order['X'],
+                'avgPrice': order['ap'],
+                'executedQty': order['z'],
+                'side': order['S'],
+                'positionSide': order['ps'],
+                'stopPrice': order['sp'],
+                'time': orders.get(order['i'], {}).get('time', order['T']),
+                'type': order['o'],
+            }
+        else:
+            orders.pop(order['i'], None)
+        book['orders'][symbol] = orders
+
+        if (order['x'] == 'TRADE' and 
+            not order['t'] in (i['id'] for i in book['fills'][symbol])):
+            book['fills'][symbol] = [{'time': order['T'], 'id': order['t'], 
+                                      'side': order['S']}] + book['fills'][symbol][:9]
+            tools.invalidate_ledger(symbol)
+
+    elif message.get('e') == 'ACCOUNT_UPDATE':
+        for i in message['a']['P']:
+            if i['s'] in book['pending']:
+                book['pending'][i['s']].append({**message, 'a': {**message['a'], 'P': [i]}})
+                continue
+            elif not i['s'] in book['symbols']:
+                continue
+
+            positions = dict(book['positions'][i['s']])
+            old = positions.get(i['ps'], {})
+            positions[i['ps']] = {
+                **old,
+                'symbol': i['s'],
+                'markPrice': old.get('markPrice', i['ep']),
+                'entryPrice': i['ep'],
+                'positionAmt': i['pa'],
+                'positionSide': i['ps'],
+                'unRealizedProfit': i['up'],
+                'updateTime': message['E'],
+            }
+            book['positions'][i['s']] = positions
+
+def user_stream(symbols:list, stream_url:str = "wss://fstream.binance.com",
+                keepalive:float = 1800, reconnect:float = 5) -> None:
+    """
+    User stream
+
+    Subscribe to the user data stream and keep the open orders, positions 
+        and fills of 'symbols' updated in '_commons.__book', so that 
+        'tradetools.open_orders' and 'tradetools.open_trades' do not request 
+        the Binance API.
+
+    Note:
+        The listen key is renewed every 'keepalive' seconds. If the connection 
+        is lost it reconnects automatically every 'reconnect' seconds and the 
+        book is requested again with 'sync_book'.
+
+    Args:
+        symbols (list): Symbols kept in the book.
+        stream_url (str, optional): WebSocket server url.
+        keepalive (float, optional): Seconds between listen key renewals.
+        reconnect (float, optional): Seconds to wait before reconnecting.
+    """
+
+    listen_key = None
+    reconnecting = False
+
+    def current(manager) -> bool:
+        # The callbacks of the replaced clients are ignored.
+        stream = _commons.__user_stream
+        return not stream is None and getattr(stream, 'socket_manager', None) is manager
+
+    def on_message(manager, message:str) -> None:
+        message = json.loads(message)
+
+        if message.get('e') == 'listenKeyExpired':
+            on_close(manager)
+        else:
+            update_book(message)
+
+    def on_close(manager, *_) -> None:
+        if current(manager):
+            start_reconnect()
+
+    def on_error(manager, error) -> None:
+        main.print_log(f"User stream error: {error}", alert=True)
+
+        # The errors of the callbacks keep the connection open.
+        if current(manager) and not getattr(getattr(manager, 'ws', None), 'connected', False):
+            start_reconnect()
+
+    def start_reconnect() -> None:
+        nonlocal reconnecting
+
+        # Only one reconnect loop at a time.
+        with __lock:
+            if reconnecting:
+                return
+            reconnecting = True
+
+        main.print_log('⚠️ User stream connection lost.', alert=True)
+        _commons.__book = None
+        Thread(target=reconnect_loop, daemon=True).start()
+
+    def reconnect_loop() -> None:
+        nonlocal reconnecting
+
+        try:
+            while not _commons.__user_stream is None:
+                te.sleep(reconnect)
+                try:
+                    connect()
+                    main.print_log('User stream reconnected.')
+                    return
+                except Exception as e:
+                    main.print_log(f"Error when reconnecting the user stream: {e}", alert=True)
+        finally:
+            with __lock:
+                reconnecting = False
+
+    def keepalive_loop(key:str) -> None:
+        while not _commons.__user_stream is None and key == listen_key:
+            te.sleep(keepalive)
+            try:
+                if key == listen_key:
+                    _commons.__client.renew_listen_key(listenKey=key)
+            except Exception as e:
+                main.print_log(f"Error when renewing the listen key: {e}", alert=True)
+
+    def connect() -> None:
+        nonlocal listen_key
+
+        old = _commons.__user_stream
+
+        listen_key = _commons.__client.new_listen_key()['listenKey']
+        book = {'symbols': set(), 'orders': {}, 'positions': {}, 
+                'fills': {}, 'pending': {}}
+
+        _commons.__book = book
+        _commons.__user_stream = UMFuturesWebsocketClient(
+            stream_url=stream_url, on_message=on_message,
+            on_close=on_close, on_error=on_error)
+        _commons.__user_stream.user_data(listen_key=listen_key)
+
+        if not old is None:
+            Thread(target=old.stop, daemon=True).start()
+
+        # Reconciliation, the stream only has the changes.
+        for i in symbols:
+            sync_book(i)
+
+        Thread(target=keepalive_loop, args=(listen_key,), daemon=True).start()
+
+    connect()
+
+def stop_user_stream() -> None:
+    """
+    Stop user stream
+
+    Close the user data stream, the book is no longer used.
+    """
+
+    stream, _commons.__user_stream = _commons.__user_stream, None
+    _commons.__book = None
+
+    if not stream is None:
+        stream.stop()
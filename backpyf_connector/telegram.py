@@ -14,6 +14,7 @@ Functions:
     sistem_command: Send account balance and open trades data.
     last_command: Send all logs that were sent.
     ip_command: Send the public IP of the machine.
+    latency_command: Send the latency of each Binance endpoint.
     off_command: Command to shut down the system.
 """
 
@@ -23,8 +24,10 @@ from telegram import Update
 from sys import exit
 import asyncio
 
-from . import tradetools as tools
+from . import asynctools as atools
 from . import _commons as _cm
+from . import transport
+from . import limiter
 from . import main
 
 def bot_init(api_key:str) -> None:
@@ -48,6 +51,7 @@ def bot_init(api_key:str) -> None:
     app.add_handler(CommandHandler("last", last_command))
     app.add_handler(CommandHandler("off", off_command))
     app.add_handler(CommandHandler("ip", ip_command))
+    app.add_handler(CommandHandler("latency", latency_command))
 
     _cm.__loop.run_until_complete(on_startup(app))
 
@@ -126,6 +130,7 @@ async def help_command(update: Update, context: CallbackContext) -> None:
         /help - Get help.
         /off - Turn off the systems and the bot (chatid). 
         /ip - Get the system's current public IP address (chatid). 
+        /latency - Get the latency of each Binance endpoint in ms (chatid). 
         """, False))
 
 async def chatid_command(update: Update, context: CallbackContext) -> None:
@@ -161,7 +166,9 @@ async def sistem_command(update: Update, context: CallbackContext) -> None:
         await update.message.reply_text("System not executed.")
         return
 
-    open_trades = tools.open_trades(_cm.__symbol)
+    open_trades, balance, commission = await asyncio.gather(
+        atools.open_trades(_cm.__symbol), atools.get_balance(), 
+        atools.get_commission(_cm.__symbol))
     trades = "".join(text_fix(
         f"""
         Trade {i+1}: {{
@@ -170,6 +177,7 @@ async def sistem_command(update: Update, context: CallbackContext) -> None:
         type: {open_trades.iloc[i]['Type']}
         }}""", False) for i in open_trades.index)
 
+    weight = limiter.budget().get('weight_1m', {})
     instances_names = "\n".join(_cm.__instances)
     await update.message.reply_text(text_fix(
         f"""
@@ -178,8 +186,9 @@ async def sistem_command(update: Update, context: CallbackContext) -> None:
         }}
 
         System Statistics:
-        Balance: {round(tools.get_balance(), 2)}
-        Commission: {tools.get_commission(_cm.__symbol)}
+        Balance: {round(balance, 2)}
+        Commission: {commission}
+        Weight budget: {weight.get('remaining')}/{weight.get('limit')}
         {trades}
         """, False))
 
@@ -224,6 +233,21 @@ async def ip_command(update: Update, context: CallbackContext) -> None:
         Do not share this information with anyone.
         """, False))
 
+async def latency_command(update: Update, context: CallbackContext) -> None:
+    """
+    Latency command
+
+    Send the latency of each Binance endpoint of 'transport.dump' 
+        only if the chatid is the same as '_cm.__chat_id'.
+    """
+
+    if str(update.effective_chat.id) != str(_cm.__chat_id):
+        main.print_log("Latency request, chat id does not match.", alert=True)
+        await update.message.reply_text("Chat id does not match.")
+        return
+
+    await update.message.reply_text(transport.dump())
+
 async def off_command(update: Update, context: CallbackContext) -> None:
     """
     Off command
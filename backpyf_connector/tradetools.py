@@ -1,8 +1,16 @@
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
+from threading import Thread
 import pandas as pd
+import numpy as np
+import time as te
 
 from . import _commons
+from . import limiter
+from . import rounding
+from . import clock
+from . import store
 
 def get_balance() -> float:
     """
@@ -19,33 +27,373 @@ def get_balance() -> float:
         if info_bl[i]['asset'].upper() == 'USDT': 
             return float(info_bl[i]['availableBalance'])
         
+def get_config(symbol:str, key:str):
+    """
+    Get config
+
+    This function returns a value saved with 'save_config'.
+
+    Args:
+        symbol (str): Symbol of the value.
+        key (str): Name of the value.
+
+    Returns:
+        Value saved or None if it does not exist or 
+            is older than '_commons.__config_ttl' seconds.
+    """
+
+    value = _commons.__config.get(symbol, {}).get(key)
+    if value is None or te.time()-value[1] > _commons.__config_ttl:
+        return None
+
+    return value[0]
+
+def save_config(symbol:str, key:str, value) -> None:
+    """
+    Save config
+
+    This function saves a value of the account configuration in '_commons.__config'.
+
+    Args:
+        symbol (str): Symbol of the value.
+        key (str): Name of the value.
+        value: Value to save.
+    """
+
+    _commons.__config.setdefault(symbol, {})[key] = (value, te.time())
+
+def invalidate_config(symbol:str = None, key:str = None) -> None:
+    """
+    Invalidate config
+
+    This function removes the values saved with 'save_config' 
+        so that they are requested again.
+
+    Args:
+        symbol (str, optional): Symbol of the values, if None all symbols.
+        key (str, optional): Name of the value, if None all values.
+    """
+
+    if symbol is None:
+        _commons.__config = {}
+    elif key is None:
+        _commons.__config.pop(symbol, None)
+    else:
+        _commons.__config.get(symbol, {}).pop(key, None)
+
 def get_commission(symbol) -> float:
     """
     Get commission
 
     This function requests the taker operation fees from the Binance API.
 
+    Note:
+        The value is saved with 'save_config'.
+
     Returns:
         float: takerCommissionRate.
     """
 
-    commission_info = _commons.__client.commission_rate(symbol=symbol, recvWindow=_commons.__recvWindow)
-    return float(commission_info['takerCommissionRate'])
+    if (commission:=get_config(symbol, 'commission')) is None:
+        commission_info = _commons.__client.commission_rate(symbol=symbol, recvWindow=_commons.__recvWindow)
+        commission = float(commission_info['takerCommissionRate'])
+
+        save_config(symbol, 'commission', commission)
+
+    return commission
+
+def set_leverage(symbol:str, leverage:int) -> None:
+    """
+    Set leverage
+
+    This function changes the leverage of 'symbol' in Binance 
+        if it is not the one saved with 'save_config'.
+
+    Args:
+        symbol (str): Symbol to change.
+        leverage (int): New leverage.
+    """
+
+    if get_config(symbol, 'leverage') == leverage:
+        return
+
+    _commons.__client.change_leverage(symbol=symbol, leverage=leverage, 
+                                      recvWindow=_commons.__recvWindow)
+    save_config(symbol, 'leverage', leverage)
+
+def set_margin_type(symbol:str, ps_type:str) -> None:
+    """
+    Set margin type
+
+    This function changes the margin type of 'symbol' in Binance 
+        if it is not the one saved with 'save_config'.
+
+    Args:
+        symbol (str): Symbol to change.
+        ps_type (str): New margin type.
+    """
+
+    if get_config(symbol, 'ps_type') == ps_type:
+        return
+
+    _commons.__client.change_margin_type(symbol=symbol, marginType=ps_type, 
+                                         recvWindow=_commons.__recvWindow)
+    save_config(symbol, 'ps_type', ps_type)
+
+def load_symbols() -> dict:
+    """
+    Load symbols
+
+    This function requests the Binance API for the exchange information 
+        and saves in '_commons.__symbols' the metadata of each symbol.
+
+    Info:
+        - quantityPrecision: Precision of the amounts.
+        - pricePrecision: Precision of the prices.
+        - tickSize: Price step from 'PRICE_FILTER'.
+        - stepSize: Amount step from 'LOT_SIZE'.
+        - minNotional: Minimum order value from 'MIN_NOTIONAL'.
+
+    Returns:
+        dict: Metadata by symbol.
+    """
+
+    info = _commons.__client.exchange_info()
+    limiter.set_limits(info.get('rateLimits', []))
+
+    symbols = {}
+    for i in info['symbols']:
+        filters = {f['filterType']: f for f in i.get('filters', [])}
+
+        symbols[i['symbol']] = {
+            'quantityPrecision': i['quantityPrecision'],
+            'pricePrecision': i['pricePrecision'],
+            'tickSize': float(filters.get('PRICE_FILTER', {}).get('tickSize', 0)),
+            'stepSize': float(filters.get('LOT_SIZE', {}).get('stepSize', 0)),
+            'minNotional': float(filters.get('MIN_NOTIONAL', {}).get('notional', 0)),
+        }
+
+    _commons.__symbols = symbols
+    _commons.__symbols_time = te.time()
+    return symbols
+
+def refresh_symbols() -> None:
+    """
+    Refresh symbols
+
+    This function calls 'load_symbols' in a new thread,
+        if it is already loading it does nothing.
+    """
+
+    if _commons.__symbols_loading:
+        return
+    _commons.__symbols_loading = True
+
+    def refresh():
+        try: load_symbols()
+        except Exception: pass
+        finally: _commons.__symbols_loading = False
+
+    Thread(target=refresh, daemon=True).start()
+
+def get_symbol_info(symbol) -> dict:
+    """
+    Get symbol info
+
+    This function returns the metadata of the symbol saved by 'load_symbols'.
+
+    Note:
+        The first time the metadata is requested, then it is refreshed 
+        in the background every '_commons.__symbols_ttl' seconds.
+
+    Returns:
+        dict: Symbol metadata, empty if the symbol does not exist.
+    """
+
+    if _commons.__symbols is None:
+        load_symbols()
+    elif te.time()-_commons.__symbols_time > _commons.__symbols_ttl:
+        refresh_symbols()
+
+    return _commons.__symbols.get(symbol, {})
 
 def get_quantity_precision_symbol(symbol) -> float:
     """
     Get quantity precision of the symbol
 
-    This function requests the Binance API for the accuracy of the amounts.
+    This function returns the accuracy of the amounts from 'get_symbol_info'.
 
     Returns:
         float: quantityPrecision.
     """
 
-    for i in _commons.__client.exchange_info()['symbols']:
-        if i['symbol'] == symbol:
-            return i['quantityPrecision']
-    return 0
+    return get_symbol_info(symbol).get('quantityPrecision', 0)
+
+def symbol_step(symbol:str, key:str) -> float:
+    """
+    Symbol step
+
+    This function returns the 'tickSize' or 'stepSize' of the symbol.
+
+    Note:
+        If the filter is missing, the step is calculated 
+        from 'pricePrecision' or 'quantityPrecision'.
+
+    Args:
+        symbol (str): Symbol.
+        key (str): 'tickSize' or 'stepSize'.
+
+    Returns:
+        float: Step.
+    """
+
+    info = get_symbol_info(symbol)
+    return info.get(key) or 10.0**-info.get(
+        'pricePrecision' if key == 'tickSize' else 'quantityPrecision', 0)
+
+def round_price(symbol:str, price:float, mode:str = 'nearest') -> str:
+    """
+    Round price
+
+    This function rounds the price to the 'tickSize' of the symbol.
+
+    Args:
+        symbol (str): Symbol.
+        price (float): Price.
+        mode (str, optional): 'down', 'up' or 'nearest'.
+
+    Returns:
+        str: Price to send.
+    """
+
+    step = symbol_step(symbol, 'tickSize')
+    return rounding.format_step(rounding.round_step(price, step, mode), step)
+
+def round_quantity(symbol:str, quantity:float, mode:str = 'down') -> str:
+    """
+    Round quantity
+
+    This function rounds the quantity to the 'stepSize' of the symbol.
+
+    Args:
+        symbol (str): Symbol.
+        quantity (float): Quantity.
+        mode (str, optional): 'down', 'up' or 'nearest'.
+
+    Returns:
+        str: Quantity to send.
+    """
+
+    step = symbol_step(symbol, 'stepSize')
+    return rounding.format_step(rounding.round_step(quantity, step, mode), step)
+
+def parse_klines(klines:list) -> pd.DataFrame:
+    """
+    Parse klines
+
+    This function converts the 'klines' response of the Binance API to a DataFrame.
+
+    Note:
+        The values are written directly to a float64 array and 
+        the DataFrame is created on it without copying.
+
+    Args:
+        klines (list): Raw candles returned by the Binance API.
+    
+    Returns:
+        pd.Dataframe: Dataframe containing the data for each step.
+    """
+
+    # Close, Open, High, Low, Volume positions in each kline.
+    values = np.fromiter((float(i[n]) for i in klines for n in (4, 1, 2, 3, 5)), 
+                         dtype=np.float64, count=len(klines)*5).reshape(-1, 5)
+    index = np.fromiter((i[0] for i in klines), dtype=np.int64, count=len(klines))
+
+    return pd.DataFrame(values, index=pd.Index(index, name='timestamp'), 
+                        columns=['Close', 'Open', 'High', 'Low', 'Volume'], copy=False)
+
+def interval_ms(interval:str) -> int:
+    """
+    Interval ms
+
+    This function returns the duration of a Binance interval in milliseconds.
+
+    Note:
+        The '1M' interval is calculated with 30 days.
+
+    Args:
+        interval (str): Binance interval.
+
+    Returns:
+        int: Duration in milliseconds.
+    """
+
+    return int(interval[:-1]) * {
+        'm': 60_000,
+        'h': 3_600_000,
+        'd': 86_400_000,
+        'w': 604_800_000,
+        'M': 2_592_000_000,
+    }[interval[-1]]
+
+def run_concurrent(functions:list, workers:int = None) -> list:
+    """
+    Run concurrent
+
+    This function executes the functions at the same time in a thread pool.
+
+    Note:
+        With a single worker they are executed one after the other without the pool.
+
+    Args:
+        functions (list): Functions without arguments to execute.
+        workers (int, optional): Maximum number of functions executed at 
+            the same time, if None '_commons.__max_workers' is used.
+
+    Returns:
+        list: Results in the same order as 'functions'.
+    """
+
+    workers = min(workers or _commons.__max_workers, len(functions))
+    if workers <= 1:
+        return [i() for i in functions]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda x: x(), functions))
+
+def fetch_range(symbol:str, interval:str, start:int) -> pd.DataFrame:
+    """
+    Fetch range
+
+    This function requests the Binance API for the candles from 'start' to the present.
+
+    Note:
+        The time is split into pages of '_commons.__klines_limit' candles 
+        that are requested at the same time with 'run_concurrent'.
+
+    Args:
+        symbol (str): Data symbol.
+        interval (str): Data interval.
+        start (int): Open time in ms of the first candle.
+    
+    Returns:
+        pd.Dataframe: Dataframe containing the data for each step.
+    """
+
+    limit = _commons.__klines_limit
+    step = interval_ms(interval)
+    end = clock.timestamp() // step * step
+
+    # The last page has no end so the open candle is always returned.
+    pages = run_concurrent([
+        lambda x=x: _commons.__client.klines(
+            symbol=symbol, interval=interval, startTime=x, 
+            endTime=x+(limit-1)*step if x+limit*step <= end else None, 
+            limit=limit, recvWindow=_commons.__recvWindow)
+        for x in range(start, end+1, limit*step)])
+
+    data = parse_klines([i for page in pages for i in page])
+    return data[~data.index.duplicated(keep='last')].sort_index()
 
 def fetch_data(symbol:str, interval:str, last:int = 50) -> pd.DataFrame:
     """
@@ -53,7 +401,62 @@ def fetch_data(symbol:str, interval:str, last:int = 50) -> pd.DataFrame:
 
     This function requests the Binance API for the 'last' number of candles.
 
+    Note:
+        If 'last' is greater than '_commons.__klines_limit', the candles 
+        are requested with 'fetch_range'.
+        If '_commons.__store_dir' is not None, the candles saved in the 
+        store are used and only the missing ones are requested, 
+        the new closed candles are saved.
+        The present is the Binance server time of 'clock.timestamp'.
+
+    Args:
+        symbol (str): Data symbol.
+        interval (str): Data interval.
+        last (int, optional): Number of steps to return starting from the present.
+    
+    Returns:
+        pd.Dataframe: Dataframe containing the data for each step.
+    """
+
+    step = interval_ms(interval)
+    start = (clock.timestamp() // step - last + 1) * step
+
+    stored = (store.read_store(symbol, interval, last=last) 
+              if _commons.__store_dir else None)
+
+    if (not stored is None and not stored.empty and 
+        stored.index[0] <= start <= stored.index[-1]):
+        data = pd.concat([stored[stored.index >= start], 
+                          fetch_range(symbol, interval, 
+                                      start=int(stored.index[-1])+step)])
+    elif last <= _commons.__klines_limit:
+        data = parse_klines(_commons.__client.klines(
+            symbol=symbol, interval=interval, limit=last, recvWindow=_commons.__recvWindow))
+    else:
+        data = fetch_range(symbol, interval, start=start)
+
+    data = data.iloc[-last:]
+    if _commons.__store_dir:
+        store.append_store(symbol, interval, data, step=step)
+
+    return data
+
+def update_data(data:pd.DataFrame, symbol:str, 
+                interval:str, last:int = 50) -> pd.DataFrame:
+    """
+    Update data
+
+    This function requests the Binance API only for the candles 
+        from the last open time of 'data' and joins them to 'data'.
+
+    Note:
+        The last candle of 'data' (still open) is replaced and the oldest 
+        rows are dropped. If 'data' is not valid or a gap is found, 
+        the 'last' candles are requested again with 'fetch_data'.
+        If '_commons.__store_dir' is not None, the new closed candles are saved.
+
     Args:
+        data (pd.DataFrame): Data returned by 'fetch_data' or 'update_data'.
         symbol (str): Data symbol.
         interval (str): Data interval.
         last (int, optional): Number of steps to return starting from the present.
@@ -62,37 +465,38 @@ def fetch_data(symbol:str, interval:str, last:int = 50) -> pd.DataFrame:
         pd.Dataframe: Dataframe containing the data for each step.
     """
 
-    klines = pd.DataFrame(_commons.__client.klines(
-        symbol=symbol, interval=interval, limit=last, recvWindow=_commons.__recvWindow), 
-        columns=['timestamp', 
-                 'Open', 
-                 'High', 
-                 'Low', 
-                 'Close', 
-                 'Volume', 
-                 'Close_time', 
-                 'Quote_asset_volume', 
-                 'Number_of_trades', 
-                 'Taker_buy_base', 
-                 'Taker_buy_quote', 
-                 'Ignore'])
-    klines.index = klines['timestamp']
-
-    return klines[[
-        'Close',
-        'Open',
-        'High',
-        'Low',
-        'Volume'
-    ]].astype(float)
+    if data is None or len(data) < last:
+        return fetch_data(symbol=symbol, interval=interval, last=last)
+
+    # The limit does not depend on 'last' so a full page means a gap.
+    klines = _commons.__client.klines(
+        symbol=symbol, interval=interval, startTime=int(data.index[-1]), 
+        limit=_commons.__klines_limit, recvWindow=_commons.__recvWindow)
+
+    # Gap: the last cached candle is not the first one or there are more pages.
+    if (not klines or klines[0][0] != data.index[-1] or 
+        len(klines) >= _commons.__klines_limit):
+        return fetch_data(symbol=symbol, interval=interval, last=last)
+
+    new = parse_klines(klines)
+    data = pd.concat([data.iloc[:-1], new]).iloc[-last:]
+    if _commons.__store_dir:
+        store.append_store(symbol, interval, new, step=interval_ms(interval))
+
+    return data
 
 def place_order(symbol:str, side:str, quantity:float, 
-                stop_price:float=None, take_profit:float=None) -> tuple:
+                stop_price:float=None, take_profit:float=None,
+                batch:bool=True) -> tuple:
     """
     Place order
 
     This function set an order.
 
+    Note:
+        If 'batch' is True the protective orders are sent together after 
+        the entry with 'create_orders'.
+
     Args:
         symbol (str): Symbol to which the order goes.
         side (str): 'BUY' or 'SELL'.
@@ -101,16 +505,19 @@ def place_order(symbol:str, side:str, quantity:float,
             order will be created at the value.
         take_profit (float, optional): If it is not None a 'TAKE_PROFIT_MARKET' 
             order will be created at the value.
+        batch (bool, optional): Send the protective orders together, 
+            otherwise they are sent one after the other with 'create_order'.
     
     Returns:
         tuple: The values ​​of the orders are returned: 
             order, stop_loss_order, take_profit_order. 
-            If it is equal to 0 it is because it was not executed correctly.
+            If it is equal to 0 it is because it was not executed correctly,
+            if it has 'code' it is the error of that order.
     """
 
-    quantity =  float(str(quantity)[:str(quantity).find('.')+1+get_quantity_precision_symbol(symbol)])
+    quantity = round_quantity(symbol, quantity)
     
-    if quantity <= 0:
+    if float(quantity) <= 0:
         if _commons.__logs: print('Place order error.')
         return 0, 0, 0
 
@@ -121,31 +528,28 @@ def place_order(symbol:str, side:str, quantity:float,
         quantity=quantity,
         recvWindow=_commons.__recvWindow,
     )
+    invalidate_ledger(symbol)
+    invalidate_snapshot()
 
-    stop_loss_order = 0
-    take_profit_order = 0
-
+    legs = {}
     if stop_price != None: 
-        stop_price = float(str(stop_price)[:str(stop_price).find('.')+get_quantity_precision_symbol(symbol)])
-
-        stop_loss_order = create_order(
-            symbol=symbol,
-            side='SELL' if side else 'BUY',
-            type_='STOP_MARKET',
-            price=stop_price,
-            quantity=quantity
-        )
-        stop_loss_order 
+        legs['STOP_MARKET'] = round_price(symbol, stop_price)
     if take_profit != None:
-        take_profit = float(str(take_profit)[:str(take_profit).find('.')+get_quantity_precision_symbol(symbol)])
+        legs['TAKE_PROFIT_MARKET'] = round_price(symbol, take_profit)
+
+    close_side = 'SELL' if side == 'BUY' else 'BUY'
+    if batch:
+        orders = create_orders(symbol=symbol, orders=[
+            dict(side=close_side, quantity=quantity, price=price, type_=type_)
+            for type_, price in legs.items()])
+        orders = dict(zip(legs.keys(), orders))
+    else:
+        orders = {type_: create_order(symbol=symbol, side=close_side, type_=type_,
+                                      price=price, quantity=quantity)
+                  for type_, price in legs.items()}
 
-        stop_loss_order = create_order(
-            symbol=symbol,
-            side='SELL' if side else 'BUY',
-            type_='TAKE_PROFIT_MARKET',
-            price=take_profit,
-            quantity=quantity,
-        )
+    stop_loss_order = orders.get('STOP_MARKET', 0)
+    take_profit_order = orders.get('TAKE_PROFIT_MARKET', 0)
 
     if _commons.__logs: print('Place order successful.')
     return order, stop_loss_order, take_profit_order
@@ -168,8 +572,8 @@ def create_order(symbol:str, side:str, quantity:float,
         dict: Order.
     """
 
-    quantity =  float(str(quantity)[:str(quantity).find('.')+1+get_quantity_precision_symbol(symbol)])
-    price = float(str(price)[:str(price).find('.')+get_quantity_precision_symbol(symbol)])
+    quantity = round_quantity(symbol, quantity)
+    price = round_price(symbol, price)
 
     order_ = _commons.__function(
                 symbol=symbol,
@@ -181,10 +585,68 @@ def create_order(symbol:str, side:str, quantity:float,
                 closePosition=True,
                 recvWindow=_commons.__recvWindow,
             )
+    add_order(symbol, order_)
+    invalidate_snapshot()
 
     if _commons.__logs: print('Create order successful.')
     return order_
 
+def create_orders(symbol:str, orders:list) -> list:
+    """
+    Create orders
+
+    This function creates several orders at the same time.
+
+    Note:
+        They are sent in a single 'new_batch_order' request, in test mode 
+        there is no batch test request so they are sent at the same 
+        time with 'create_order' and 'run_concurrent'.
+
+    Args:
+        symbol (str): Symbol to which the orders go.
+        orders (list): Orders, each one a dict with the 
+            'create_order' arguments: side, quantity, price, type_.
+    
+    Returns:
+        list: Result of each order in the same order as 'orders', 
+            if it has 'code' it is the error of that order.
+    """
+
+    if not orders:
+        return []
+
+    batch = getattr(_commons.__function, '__name__', None) == 'new_order'
+    if not batch:
+        def create(order):
+            try:
+                return create_order(symbol=symbol, **order)
+            except Exception as e:
+                return {'code': getattr(e, 'error_code', None), 'msg': str(e)}
+
+        results = run_concurrent([lambda x=x: create(x) for x in orders])
+    else:
+        results = []
+        # The batch request accepts 5 orders at most.
+        for i in range(0, len(orders), 5):
+            results.extend(_commons.__client.new_batch_order(batchOrders=[{
+                'symbol': symbol,
+                'side': x['side'],
+                'type': x['type_'],
+                'stopPrice': round_price(symbol, x['price']),
+                'quantity': round_quantity(symbol, x['quantity']),
+                'closePosition': 'true',
+            } for x in orders[i:i+5]]))
+
+    invalidate_snapshot()
+    for order, result in zip(orders, results):
+        if batch: add_order(symbol, result)
+
+        if isinstance(result, dict) and 'code' in result:
+            if _commons.__logs: print(f"Create order error {order['type_']}: {result.get('msg')}")
+        elif batch and _commons.__logs: print('Create order successful.')
+
+    return results
+
 def cancel_order(symbol:str, id:int) -> dict:
     """
     Cancel a order
@@ -199,10 +661,62 @@ def cancel_order(symbol:str, id:int) -> dict:
         dict: Closed order.
     """
     
-    if _commons.__logs: print('Cancel order successful.')
-    return _commons.__client.cancel_order(symbol=symbol,
+    order_ = _commons.__client.cancel_order(symbol=symbol,
                                orderId=str(int(id)),
                                recvWindow=_commons.__recvWindow)
+    remove_order(symbol, int(id))
+    invalidate_snapshot()
+
+    if _commons.__logs: print('Cancel order successful.')
+    return order_
+
+def cancel_orders(symbol:str, ids:list = None) -> list:
+    """
+    Cancel orders
+
+    This function cancels several orders at the same time.
+
+    Note:
+        The orders are canceled with 'cancel_batch_order' in requests of 10 
+        sent at the same time with 'run_concurrent', if 'ids' is None all 
+        the open orders of 'symbol' are canceled with 'cancel_open_orders'.
+
+    Args:
+        symbol (str): Symbol where the orders are.
+        ids (list, optional): IDs of the orders you want to close.
+    
+    Returns:
+        list: Result of each order in the same order as 'ids', if it has 'code' 
+            it is the error of that order. If 'ids' is None the result 
+            of 'cancel_open_orders'.
+    """
+
+    if ids is None:
+        results = [_commons.__client.cancel_open_orders(
+            symbol=symbol, recvWindow=_commons.__recvWindow)]
+        _commons.__orders.pop(symbol, None)
+    elif not ids:
+        return []
+    else:
+        ids = [int(i) for i in ids]
+
+        # The batch request accepts 10 orders at most.
+        results = [i for chunk in run_concurrent([
+            lambda x=x: _commons.__client.cancel_batch_order(
+                symbol=symbol, orderIdList=ids[x:x+10], origClientOrderIdList=None,
+                recvWindow=_commons.__recvWindow)
+            for x in range(0, len(ids), 10)]) for i in chunk]
+
+        for id, result in zip(ids, results):
+            if isinstance(result, dict) and 'code' in result:
+                if _commons.__logs: print(f"Cancel order error {id}: {result.get('msg')}")
+            else:
+                remove_order(symbol, id)
+
+    invalidate_snapshot()
+
+    if _commons.__logs: print('Cancel orders successful.')
+    return results
 
 def convert_to_float(data:pd.DataFrame, include:list) -> pd.DataFrame:
     """
@@ -221,22 +735,21 @@ def convert_to_float(data:pd.DataFrame, include:list) -> pd.DataFrame:
     data[include] = data[include].astype(float)
     return data
 
-def open_orders(symbol:str, id:int=None) -> pd.DataFrame:
+def format_orders(orders:list, id:int=None) -> pd.DataFrame:
     """
-    Open orders
+    Format orders
 
-    This function requests open orders from the Binance API.
+    This function converts the orders of the Binance API to the 'open_orders' DataFrame.
 
     Args:
-        symbol (str): Symbol of orders.
-        id (int, optional): All orders with this id.
+        orders (list): Orders as returned by the Binance API.
+        id (int, optional): All orders with this id or greater.
 
     Returns:
         pd.DataFrame: The orders.
     """
 
-    data = pd.DataFrame(_commons.__client.get_all_orders(symbol=symbol, orderId=id, 
-                                              recvWindow=_commons.__recvWindow))[[
+    data = pd.DataFrame(orders, columns=[
         'orderId',
         'symbol',
         'status',
@@ -247,8 +760,10 @@ def open_orders(symbol:str, id:int=None) -> pd.DataFrame:
         'stopPrice',
         'time',
         'type'
-    ]]
+    ])
     data = data[data['status'] == 'NEW']
+    if not id is None:
+        data = data[data['orderId'] >= id]
     data['Type'] = data['executedQty'].apply(lambda x: 1 if float(x)>0 else 0)
 
     include = [
@@ -260,12 +775,209 @@ def open_orders(symbol:str, id:int=None) -> pd.DataFrame:
 
     return convert_to_float(data, include)
 
+def index_orders(orders:list) -> dict:
+    """
+    Index orders
+
+    This function creates the open orders table indexed by 'orderId' and by 'type'.
+
+    Args:
+        orders (list): Orders as returned by the Binance API.
+
+    Returns:
+        dict: Table with the orders by id ('id') and by type and id ('type').
+    """
+
+    table = {'id': {}, 'type': {}}
+    for i in orders:
+        if i.get('status') == 'NEW':
+            table['id'][i['orderId']] = i
+            table['type'].setdefault(i['type'], {})[i['orderId']] = i
+
+    return table
+
+def orders_table(symbol:str, refresh:bool = False) -> dict:
+    """
+    Orders table
+
+    This function returns the open orders table of 'symbol' saved in '_commons.__orders'.
+
+    Note:
+        If the user data stream book has 'symbol' the table is created from 
+        '_commons.__book', otherwise the open orders are requested to the 
+        Binance API if the table does not exist or 'refresh' is True.
+
+    Args:
+        symbol (str): Symbol of orders.
+        refresh (bool, optional): Request the open orders again.
+
+    Returns:
+        dict: Table of 'index_orders'.
+    """
+
+    table = _commons.__orders.get(symbol)
+
+    if not _commons.__book is None and symbol in _commons.__book['symbols']:
+        orders = _commons.__book['orders'][symbol]
+
+        # The book replaces the dictionary on every change.
+        if table is None or not table.get('source') is orders:
+            table = index_orders(orders.values())
+            table['source'] = orders
+
+    elif table is None or refresh or 'source' in table:
+        table = index_orders(_commons.__client.get_orders(
+            symbol=symbol, recvWindow=_commons.__recvWindow))
+
+    _commons.__orders[symbol] = table
+    return table
+
+def add_order(symbol:str, order:dict) -> None:
+    """
+    Add order
+
+    This function adds a created order to the open orders table of 'symbol'.
+
+    Args:
+        symbol (str): Symbol of the order.
+        order (dict): Order returned by the Binance API.
+    """
+
+    table = _commons.__orders.get(symbol)
+    if table is None or not isinstance(order, dict) or not 'orderId' in order:
+        return
+
+    order = {'status': 'NEW', **order}
+    table['id'][order['orderId']] = order
+    table['type'].setdefault(order['type'], {})[order['orderId']] = order
+
+def remove_order(symbol:str, id:int) -> None:
+    """
+    Remove order
+
+    This function removes an order from the open orders table of 'symbol'.
+
+    Args:
+        symbol (str): Symbol of the order.
+        id (int): ID of the order.
+    """
+
+    table = _commons.__orders.get(symbol)
+    if table is None or not id in table['id']:
+        return
+
+    table['type'][table['id'].pop(id)['type']].pop(id, None)
+
+def find_orders(symbol:str, type_:str, id:int = None, side:str = None, 
+                position_side:str = None) -> list:
+    """
+    Find orders
+
+    This function returns the open orders of 'type_' from the 
+        table of 'orders_table' without requesting the Binance API.
+
+    Args:
+        symbol (str): Symbol of orders.
+        type_ (str): Order type.
+        id (int, optional): Only orders with this id or greater.
+        side (str, optional): Only orders of this side, 'BUY' or 'SELL'.
+        position_side (str, optional): Only orders of this position side.
+
+    Returns:
+        list: Orders sorted by 'orderId'.
+    """
+
+    orders = orders_table(symbol)['type'].get(type_, {})
+    return [orders[i] for i in sorted(orders) 
+            if (id is None or i >= id) and 
+            (side is None or orders[i].get('side') == side) and 
+            (position_side is None or 
+             orders[i].get('positionSide', 'BOTH') == position_side)]
+
+def open_orders(symbol:str, id:int=None) -> pd.DataFrame:
+    """
+    Open orders
+
+    This function requests open orders from the Binance API.
+
+    Note:
+        The orders are served from the table of 'orders_table', it is only 
+        requested if it does not exist, 'account_snapshot' refreshes it on 
+        each tick and the orders sent or canceled update it.
+        If the user data stream book has 'symbol' they are not requested.
+
+    Args:
+        symbol (str): Symbol of orders.
+        id (int, optional): All orders with this id.
+
+    Returns:
+        pd.DataFrame: The orders.
+    """
+
+    return format_orders(list(orders_table(symbol)['id'].values()), id=id)
+
+def format_trades(positions:list, fills:list) -> pd.DataFrame:
+    """
+    Format trades
+
+    This function converts the positions of the Binance API to the 'open_trades' DataFrame.
+
+    Args:
+        positions (list): Positions as returned by the Binance API.
+        fills (list): Last fills from newest to oldest, each one with 'time', 'id' and 'side'.
+
+    Returns:
+        pd.DataFrame: Open trades.
+    """
+
+    if positions == []:
+        return pd.DataFrame()
+
+    # The columns are created with their type, without converting the DataFrame.
+    columns = {i: [float(x[i]) for x in positions] for i in [
+        'markPrice',
+        'entryPrice', 
+        'positionAmt',
+        'unRealizedProfit',
+        'updateTime',
+    ]}
+    columns['symbol'] = [x['symbol'] for x in positions]
+    columns['positionSide'] = [x['positionSide'] for x in positions]
+
+    # Each position gets the fill in the same position.
+    fills = list(fills[:len(positions)])
+    missing = [np.nan]*(len(positions)-len(fills))
+    for i in ('time', 'id', 'side'):
+        columns[i] = [x[i] for x in fills] + missing
+
+    columns['time'] = np.array(columns['time'], dtype=np.float64)
+    columns['Type'] = [1 if x > 0 else 0 for x in columns['positionAmt']]
+
+    return pd.DataFrame(columns, columns=[
+        'symbol',
+        'markPrice',
+        'entryPrice', 
+        'positionAmt',
+        'positionSide', 
+        'unRealizedProfit',
+        'updateTime',
+        'time',
+        'id',
+        'side',
+        'Type',
+    ])
+
 def open_trades(symbol:str) -> pd.DataFrame:
     """
     Open trades
 
     This function asks the Binance API for open trades on 'symbol'.
 
+    Note:
+        If the user data stream book has 'symbol', 
+        the trades are served from '_commons.__book'.
+        Only the positions with 'positionAmt' different from 0 are trades.
+
     Args:
         symbol (str): Symbol of trades.
 
@@ -273,81 +985,228 @@ def open_trades(symbol:str) -> pd.DataFrame:
         pd.DataFrame: Open trades.
     """
 
-    data = _commons.__client.get_position_risk(symbol=symbol, recvWindow=_commons.__recvWindow)
-
-    if not data == []:
-        data = pd.DataFrame(data)[[
-            'symbol',
-            'markPrice',
-            'entryPrice', 
-            'positionAmt',
-            'positionSide', 
-            'unRealizedProfit',
-            'updateTime',
-        ]]
-        extended_ = pd.DataFrame(_commons.__client.get_account_trades(symbol=symbol), 
-                                columns=['time','id','side']).iloc[::-1].reset_index(drop=True)
-
-        data['time'] = extended_['time']
-        data['id'] = extended_['id']
-        data['side'] = extended_['side']
-
-        data['Type'] = data['positionAmt'].apply(lambda x: 1 if float(x)>0 else 0)
-
-        include = [
-            'time',
-            'updateTime',
-            'markPrice',
-            'entryPrice', 
-            'positionAmt',
-            'unRealizedProfit',
-        ]
-
-        return convert_to_float(data, include)
-    else:
+    if not _commons.__book is None and symbol in _commons.__book['symbols']:
+        return format_trades(
+            [i for i in _commons.__book['positions'][symbol].values() 
+             if float(i['positionAmt']) != 0], 
+            _commons.__book['fills'][symbol])
+
+    # The closed positions are returned with 'positionAmt' 0 in hedge mode.
+    data = [i for i in _commons.__client.get_position_risk(
+                symbol=symbol, recvWindow=_commons.__recvWindow)
+            if float(i['positionAmt']) != 0]
+    if data == []:
         return pd.DataFrame()
 
-def generate_more(function:callable, days:int=30) -> list:
+    return format_trades(data, _commons.__client.get_account_trades(symbol=symbol)[::-1])
+
+def account_snapshot(symbol:str, refresh:bool = False) -> dict:
+    """
+    Account snapshot
+
+    This function returns the balance, open trades and open orders of 'symbol' 
+        saved in '_commons.__snapshot', all the strategies of a tick use it.
+
+    Note:
+        The snapshot is requested at the same time with 'run_concurrent' if 
+        it does not exist, it is of another symbol or 'refresh' is True.
+        It is invalidated when an order is sent or canceled.
+
+    Args:
+        symbol (str): Symbol of trades and orders.
+        refresh (bool, optional): Request the snapshot again.
+
+    Returns:
+        dict: Snapshot with 'symbol', 'balance', 'trades' (DataFrame of 
+            'open_trades') and 'orders' (orders for 'format_orders').
+    """
+
+    snapshot = _commons.__snapshot
+    if refresh or snapshot is None or snapshot['symbol'] != symbol:
+        balance, trades, orders = run_concurrent([
+            get_balance,
+            lambda: open_trades(symbol=symbol),
+            lambda: orders_table(symbol=symbol, refresh=True),
+        ])
+
+        snapshot = {
+            'symbol': symbol,
+            'balance': balance,
+            'trades': trades,
+            'orders': list(orders['id'].values()),
+        }
+        _commons.__snapshot = snapshot
+
+    return snapshot
+
+def invalidate_snapshot() -> None:
+    """
+    Invalidate snapshot
+
+    This function removes the account snapshot so that it is requested again.
+    """
+
+    _commons.__snapshot = None
+
+def generate_windows(days:int = 30, requests_days:int = 6) -> list:
+    """
+    Generate windows
+
+    This function splits the last 'days' into windows of 'requests_days' days.
+
+    Args:
+        days (int, optional): Number of days.
+        requests_days (int, optional): Days of each window.
+
+    Returns:
+        list: Windows from newest to oldest, each one (end, start) in ms.
+    """
+
+    windows = []
+
+    now = datetime.fromtimestamp(clock.timestamp()/1000, timezone.utc)
+    while days > 0:
+        next = now-timedelta(days=min(requests_days, days))
+
+        windows.append((int(now.timestamp() * 1000), 
+                        int(next.timestamp() * 1000)))
+
+        days -= requests_days
+        now = next
+
+    return windows
+
+def generate_more(function:callable, days:int=30, workers:int=None) -> list:
     """
     Generate more
 
     This function is designed to execute the same 
         request to the API several times and obtain more data.
 
+    Note:
+        All the windows of 'generate_windows' are requested 
+        at the same time with 'run_concurrent'.
+
     Args:
         function (callable): Function where the request to the API is executed.
         days (int, optional): Number of days to request.
+        workers (int, optional): Maximum number of requests at the same time, 
+            if None '_commons.__max_workers' is used.
 
     Returns:
         list: Result.
     """
 
-    data = []
-    requests_days = 6
+    results = run_concurrent([
+        lambda end=end, start=start: function(end=end, start=start)
+        for end, start in generate_windows(days)], workers=workers)
 
-    now = datetime.now(timezone.utc)
-    for i in range(days//requests_days):
-        next = now-timedelta(days=requests_days)
+    return [i for result in results for i in result[::-1]]
 
-        data.extend(function(end=int(now.timestamp() * 1000), 
-                             start=int(next.timestamp() * 1000))[::-1])
-        
-        now = next
+def generate_more_iter(function:callable, days:int=30, workers:int=None):
+    """
+    Generate more iterator
 
-    days_f = days-days//requests_days*requests_days
-    if days_f > 0:
-        data.extend(function(
-            end=int(now.timestamp() * 1000),
-            start=int((now-timedelta(days=days_f)).timestamp() * 1000)
-            )[::-1])
+    This function is the same as 'generate_more' but it yields the result 
+        of each window as soon as it arrives.
 
-    return data
+    Args:
+        function (callable): Function where the request to the API is executed.
+        days (int, optional): Number of days to request.
+        workers (int, optional): Maximum number of requests at the same time, 
+            if None '_commons.__max_workers' is used.
+
+    Yields:
+        tuple: Index of the window (0 is the newest) and its result.
+    """
+
+    windows = generate_windows(days)
+    workers = min(workers or _commons.__max_workers, len(windows)) or 1
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(function, end=end, start=start): n
+                   for n, (end, start) in enumerate(windows)}
+
+        for future in as_completed(futures):
+            yield futures[future], future.result()[::-1]
+
+def invalidate_ledger(symbol:str) -> None:
+    """
+    Invalidate ledger
+
+    This function marks the trade ledger of 'symbol' so that
+        the new trades are requested the next time it is used.
+
+    Args:
+        symbol (str): Symbol of trades.
+    """
+
+    if symbol in _commons.__ledger:
+        _commons.__ledger[symbol]['time'] = None
+
+def sync_ledger(symbol:str, days:int = 30) -> dict:
+    """
+    Sync ledger
+
+    This function updates the trade ledger of 'symbol' in '_commons.__ledger'.
+
+    Note:
+        The first time the last 'days' are requested with 'generate_more', 
+        then only the trades after the last id are requested with 'fromId'. 
+        It is only updated if it was invalidated with 'invalidate_ledger' 
+        or it is older than '_commons.__ledger_ttl' seconds.
+
+    Args:
+        symbol (str): Symbol of trades.
+        days (int, optional): Number of days kept in the ledger.
+
+    Returns:
+        dict: Ledger with the trades from oldest to newest ('trades'), 
+            the DataFrame of 'closed_trades' ('frame') and the sync time ('time').
+    """
+
+    ledger = _commons.__ledger.get(symbol)
+    if (not ledger is None and not ledger['time'] is None and 
+        te.time()-ledger['time'] <= _commons.__ledger_ttl):
+        return ledger
+
+    if ledger is None or not ledger['trades']:
+        trades = generate_more(
+            lambda end, start: _commons.__client.get_account_trades(symbol=symbol, 
+                                                         startTime=start, 
+                                                         endTime=end), days=days)[::-1]
+        new = True
+    else:
+        trades = ledger['trades']
+        new = False
+
+        while True:
+            data = _commons.__client.get_account_trades(
+                symbol=symbol, fromId=trades[-1]['id']+1, limit=1000)
+            trades.extend(data)
+            new = new or bool(data)
+
+            if len(data) < 1000: break
+
+    limit = clock.timestamp()-days*86_400_000
+    trades = [i for i in trades if i['time'] >= limit]
+
+    if ledger is None or new or len(trades) != len(ledger['trades']):
+        ledger = {'trades': trades, 'frame': None}
+
+    ledger['time'] = te.time()
+    _commons.__ledger[symbol] = ledger
+
+    return ledger
 
 def closed_trades(symbol:str) -> pd.DataFrame:
     """
     Closed trades
 
-    This function asks the Binance API for closed trades on 'symbol'.
+    This function returns the closed trades on 'symbol' of the last 30 days.
+
+    Note:
+        The trades are served from the ledger updated with 'sync_ledger'.
 
     Args:
         symbol (str): Symbol of trades.
@@ -356,10 +1215,11 @@ def closed_trades(symbol:str) -> pd.DataFrame:
         pd.DataFrame: Close trades.
     """
 
-    data = generate_more(
-        lambda end, start: _commons.__client.get_account_trades(symbol=symbol, 
-                                                     startTime=start, 
-                                                     endTime=end))
+    ledger = sync_ledger(symbol)
+    if not ledger['frame'] is None:
+        return ledger['frame']
+
+    data = ledger['trades'][::-1]
 
     if not data == []:
         data =  pd.DataFrame(data)[[
@@ -382,6 +1242,8 @@ def closed_trades(symbol:str) -> pd.DataFrame:
             'time'
             ]
 
-        return convert_to_float(data, include)
+        ledger['frame'] = convert_to_float(data, include)
     else:
-        return pd.DataFrame()
+        ledger['frame'] = pd.DataFrame()
+
+    return ledger['frame']
@@ -0,0 +1,235 @@
+"""
+Transport module.
+
+This module contains the HTTP transport shared by the Binance clients
+    and the other requests, and the latency histograms of each endpoint.
+
+Note:
+    The histograms are HDR style: each value is saved in a bucket with a
+    relative error of 1/32 (about 3%), so the percentiles can be
+    calculated with a fixed and small memory by endpoint.
+
+Functions:
+    get_adapter: Returns the HTTP adapter shared by all the sessions.
+    get_session: Returns the HTTP session used for the requests that are not Binance.
+    bucket_index: Returns the histogram bucket of a value.
+    bucket_value: Returns the highest value of a histogram bucket.
+    endpoint_name: Returns the name of the endpoint of a url.
+    record: Save the latency of a request.
+    record_hook: Hook of the client session that saves the latency of the responses.
+    latency: Returns the latency statistics of each endpoint.
+    reset_latency: Remove the saved latencies.
+    dump: Returns the latency statistics as text.
+"""
+
+from urllib.parse import urlparse
+from threading import Lock
+import requests.adapters
+import requests
+
+from urllib3.util.retry import Retry
+
+from . import _commons
+
+__lock = Lock()
+
+def get_adapter() -> requests.adapters.HTTPAdapter:
+    """
+    Get adapter
+
+    Returns the HTTP adapter shared by all the sessions,
+        it is created the first time.
+
+    Note:
+        The connections are kept alive in a pool of '_commons.__pool_size',
+        the connection errors are retried '_commons.__http_retries' times and
+        the 5xx responses only for the requests that are not orders (POST).
+
+    Returns:
+        requests.adapters.HTTPAdapter: Shared adapter.
+    """
+
+    if _commons.__adapter is None:
+        _commons.__adapter = requests.adapters.HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=_commons.__pool_size,
+            max_retries=Retry(
+                total=_commons.__http_retries,
+                read=0,
+                backoff_factor=0.2,
+                status_forcelist=(500, 502, 503, 504),
+                allowed_methods=('GET', 'PUT', 'DELETE'),
+                respect_retry_after_header=False,
+                raise_on_status=False,
+            ),
+        )
+
+    return _commons.__adapter
+
+def get_session() -> requests.Session:
+    """
+    Get session
+
+    Returns the HTTP session used for the requests that are not Binance,
+        it is created the first time with 'get_adapter'.
+
+    Returns:
+        requests.Session: Shared session.
+    """
+
+    if _commons.__http is None:
+        session = requests.Session()
+        session.mount('https://', get_adapter())
+        _commons.__http = session
+
+    return _commons.__http
+
+def bucket_index(value:int) -> int:
+    """
+    Bucket index
+
+    Returns the histogram bucket of 'value'.
+
+    Args:
+        value (int): Value in microseconds.
+
+    Returns:
+        int: Bucket index.
+    """
+
+    if value < 32:
+        return max(value, 0)
+
+    shift = value.bit_length()-6
+    return 32*(shift+1) + (value >> shift) - 32
+
+def bucket_value(index:int) -> int:
+    """
+    Bucket value
+
+    Returns the highest value of the histogram bucket 'index'.
+
+    Args:
+        index (int): Bucket index.
+
+    Returns:
+        int: Value in microseconds.
+    """
+
+    if index < 32:
+        return index
+
+    shift, top = divmod(index-32, 32)
+    return ((top+33) << shift) - 1
+
+def endpoint_name(url:str) -> str:
+    """
+    Endpoint name
+
+    Returns the name of the endpoint of 'url',
+        for example 'klines' or 'order/test'.
+
+    Args:
+        url (str): Request url.
+
+    Returns:
+        str: Endpoint name.
+    """
+
+    path = urlparse(url).path.strip('/').split('/')
+    return '/'.join(path[2:] if len(path) > 2 and path[0] == 'fapi' else path)
+
+def record(endpoint:str, seconds:float) -> None:
+    """
+    Record
+
+    Save the latency of a request in the histogram of 'endpoint'.
+
+    Args:
+        endpoint (str): Endpoint name.
+        seconds (float): Latency.
+    """
+
+    value = int(seconds*1e6)
+    with __lock:
+        histogram = _commons.__latency.setdefault(
+            endpoint, {'counts': {}, 'count': 0, 'sum': 0, 'max': 0})
+
+        index = bucket_index(value)
+        histogram['counts'][index] = histogram['counts'].get(index, 0) + 1
+        histogram['count'] += 1
+        histogram['sum'] += value
+        histogram['max'] = max(histogram['max'], value)
+
+def record_hook(response, *args, **kwargs) -> None:
+    """
+    Record hook
+
+    Hook of the client session that saves the latency of the
+        responses, from the request until the headers are received.
+    """
+
+    record(endpoint_name(response.url), response.elapsed.total_seconds())
+
+def latency(endpoint:str = None) -> dict:
+    """
+    Latency
+
+    Returns the latency statistics of each endpoint.
+
+    Args:
+        endpoint (str, optional): Only this endpoint.
+
+    Returns:
+        dict: By endpoint: count, mean, p50, p90, p99 and max in milliseconds.
+    """
+
+    result = {}
+    with __lock:
+        for name, histogram in _commons.__latency.items():
+            if endpoint != None and name != endpoint:
+                continue
+
+            stats = {'count': histogram['count'],
+                     'mean': histogram['sum']/histogram['count']/1000}
+
+            total = 0
+            percentiles = [50, 90, 99]
+            for index in sorted(histogram['counts']):
+                total += histogram['counts'][index]
+
+                while percentiles and total >= histogram['count']*percentiles[0]/100:
+                    stats[f"p{percentiles.pop(0)}"] = min(
+                        bucket_value(index), histogram['max'])/1000
+
+            stats['max'] = histogram['max']/1000
+            result[name] = stats
+
+    return result
+
+def reset_latency() -> None:
+    """
+    Reset latency
+
+    Remove the saved latencies.
+    """
+
+    with __lock:
+        _commons.__latency = {}
+
+def dump() -> str:
+    """
+    Dump
+
+    Returns the latency statistics of 'latency' as text,
+        one line by endpoint sorted by the total time.
+
+    Returns:
+        str: Statistics in milliseconds.
+    """
+
+    stats = sorted(latency().items(), key=lambda x: -x[1]['count']*x[1]['mean'])
+    return "\n".join(
+        f"{name}: n={i['count']} mean={i['mean']:.1f} p50={i['p50']:.1f} "
+        f"p90={i['p90']:.1f} p99={i['p99']:.1f} max={i['max']:.1f}"
+        for name, i in stats) or "No requests."
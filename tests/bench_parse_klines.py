@@ -0,0 +1,61 @@
+"""
+Parse klines benchmark.
+
+Time of 'tradetools.parse_klines' against the previous parser that
+    created a DataFrame of the 12 columns and converted 5 with 'astype'.
+
+Run:
+    python tests/bench_parse_klines.py
+"""
+
+import timeit
+
+import pandas as pd
+import numpy as np
+
+from backpyf_connector.tradetools import parse_klines
+
+def parse_frame(klines:list) -> pd.DataFrame:
+    """
+    Parse frame
+
+    Previous 'parse_klines', used as reference.
+    """
+
+    klines = pd.DataFrame(klines, 
+        columns=['timestamp', 'Open', 'High', 'Low', 'Close', 'Volume', 
+                 'Close_time', 'Quote_asset_volume', 'Number_of_trades', 
+                 'Taker_buy_base', 'Taker_buy_quote', 'Ignore'])
+    klines.index = klines['timestamp']
+
+    return klines[['Close', 'Open', 'High', 'Low', 'Volume']].astype(float)
+
+def klines(size:int) -> list:
+    """
+    Klines
+
+    Returns 'size' raw candles with the format of the Binance API.
+    """
+
+    rng = np.random.default_rng(0)
+    prices = 100 + rng.standard_normal(size).cumsum()
+
+    return [[1_600_000_000_000+i*60_000, f"{p:.2f}", f"{p+1:.2f}", f"{p-1:.2f}", 
+             f"{p+0.5:.2f}", f"{v:.3f}", 1_600_000_000_000+i*60_000+59_999, 
+             '0', 10, '0', '0', '0']
+            for i, (p, v) in enumerate(zip(prices, rng.uniform(1, 100, size)))]
+
+def main() -> None:
+    for size in (100, 1000, 1500):
+        data = klines(size)
+
+        assert parse_klines(data).equals(parse_frame(data).rename_axis('timestamp'))
+
+        new = min(timeit.repeat(lambda: parse_klines(data), number=20, repeat=5))/20
+        old = min(timeit.repeat(lambda: parse_frame(data), number=20, repeat=5))/20
+
+        print(f"{size:5} klines  parse_klines {new*1e3:7.3f} ms  "
+              f"previous {old*1e3:7.3f} ms  x{old/new:.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+"""
+Rounding benchmark.
+
+Time of 'round_array' against 'round_step' by value.
+
+Run:
+    python tests/bench_rounding.py
+"""
+
+import timeit
+
+import numpy as np
+
+from backpyf_connector.rounding import round_step, round_array
+
+def main(size:int = 100_000, step:float = 0.01) -> None:
+    values = np.random.default_rng(0).uniform(-1000, 1000, size)
+
+    for mode in ('down', 'up', 'nearest'):
+        array = min(timeit.repeat(lambda: round_array(values, step, mode),
+                                  number=1, repeat=5))
+        scalar = min(timeit.repeat(lambda: [round_step(i, step, mode) for i in values],
+                                   number=1, repeat=3))
+
+        print(f"{mode:8} {size} values  round_array {array*1e3:8.2f} ms  "
+              f"round_step {scalar*1e3:8.2f} ms  x{scalar/array:.0f}")
+
+if __name__ == '__main__':
+    main()
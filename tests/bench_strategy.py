@@ -0,0 +1,43 @@
+"""
+Strategy benchmark.
+
+Time of the creation of the 'StrategyClassReal' instances, the wrappers
+    of the '_store' and '_uidc' methods are installed by 'StrategyClassReal.__prepare'
+    with the first instance of each class and the next ones only bind them.
+
+Run:
+    python tests/bench_strategy.py
+"""
+
+import timeit
+
+from backpyf_connector.strategy import StrategyClassReal
+
+def strategy(methods:int = 40) -> type:
+    """
+    Strategy
+
+    Returns a new strategy class with 'methods' methods.
+    """
+
+    attrs = {f"method_{i}": lambda self, i=i: i for i in range(methods)}
+    attrs['next'] = lambda self: None
+
+    return type('Strategy', (StrategyClassReal,), attrs)
+
+def create(cls:type) -> StrategyClassReal:
+    return cls(symbol='BTCUSDT', interval='1h', width=1, commission=0)
+
+def main(size:int = 500) -> None:
+    cls = strategy()
+
+    first = timeit.timeit(lambda: create(cls), number=1)
+    rest = min(timeit.repeat(lambda: create(cls), number=size, repeat=5))/size
+    classes = min(timeit.repeat(lambda: create(strategy()), number=50, repeat=5))/50
+
+    print(f"first instance (prepare)  {first*1e6:8.1f} us")
+    print(f"next instances            {rest*1e6:8.1f} us")
+    print(f"new class each time       {classes*1e6:8.1f} us")
+
+if __name__ == '__main__':
+    main()
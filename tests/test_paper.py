@@ -0,0 +1,97 @@
+"""
+Paper tests.
+
+Orders of the 'paper' client, opening and closing long and short
+    positions and the rejections of the Binance API.
+"""
+
+from binance.error import ClientError
+import pandas as pd
+import numpy as np
+import pytest
+
+from backpyf_connector.paper import PaperClient
+
+def client() -> PaperClient:
+    """
+    Client
+
+    Returns a 'PaperClient' over flat candles at 100.
+    """
+
+    close = np.full(20, 100.)
+    data = pd.DataFrame({'Close': close, 'Open': close, 'High': close+1,
+                         'Low': close-1, 'Volume': close},
+                        index=pd.Index(1_600_000_000_000+np.arange(20)*3_600_000,
+                                       name='timestamp'))
+
+    return PaperClient(data, 'XUSDT', '1h')
+
+def position(paper:PaperClient) -> float:
+    """
+    Position
+
+    Returns the position amount of 'paper'.
+    """
+
+    risk = paper.get_position_risk('XUSDT')
+    return float(risk[0]['positionAmt']) if risk else 0.
+
+def code(function, **kwargs) -> int:
+    """
+    Code
+
+    Returns the error code of the Binance API raised by 'function'.
+    """
+
+    with pytest.raises(ClientError) as e:
+        function(**kwargs)
+    return e.value.error_code
+
+@pytest.mark.parametrize('open_side, close_side, amount', [
+    ('BUY', 'SELL', 1.),
+    ('SELL', 'BUY', -1.),
+])
+def test_open_close(open_side, close_side, amount):
+    paper = client()
+
+    paper.new_order(symbol='XUSDT', side=open_side, type='MARKET', quantity=1)
+    assert position(paper) == amount
+
+    paper.new_order(symbol='XUSDT', side=close_side, type='MARKET', 
+                    quantity=1, reduceOnly='true')
+    assert position(paper) == 0
+
+@pytest.mark.parametrize('side', ['BUY', 'SELL'])
+@pytest.mark.parametrize('quantity', [0, -1, '-0.5', None, float('nan')])
+def test_quantity_rejected(side, quantity):
+    paper = client()
+
+    assert code(paper.new_order, symbol='XUSDT', side=side, 
+                type='MARKET', quantity=quantity) == -4003
+    assert position(paper) == 0
+
+@pytest.mark.parametrize('open_side, close_side, amount', [
+    ('BUY', 'SELL', 1.),
+    ('SELL', 'BUY', -1.),
+])
+@pytest.mark.parametrize('quantity', [0, -1])
+def test_close_quantity_rejected(open_side, close_side, amount, quantity):
+    paper = client()
+    paper.new_order(symbol='XUSDT', side=open_side, type='MARKET', quantity=1)
+
+    assert code(paper.new_order, symbol='XUSDT', side=close_side, 
+                type='MARKET', quantity=quantity, reduceOnly='true') == -4003
+    assert code(paper.new_order, symbol='XUSDT', side=close_side, type='STOP_MARKET',
+                quantity=quantity, stopPrice=95 if amount > 0 else 105) == -4003
+    assert position(paper) == amount
+
+def test_close_position():
+    paper = client()
+    paper.new_order(symbol='XUSDT', side='SELL', type='MARKET', quantity=1)
+
+    order = paper.new_order(symbol='XUSDT', side='BUY', type='STOP_MARKET', 
+                            stopPrice=105, closePosition='true')
+    assert order['status'] == 'NEW'
+    assert code(paper.new_order, symbol='XUSDT', side='BUY', type='STOP_MARKET',
+                stopPrice=105, quantity=-1, closePosition='true') == -4003
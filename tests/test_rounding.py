@@ -0,0 +1,68 @@
+"""
+Rounding tests.
+
+Property tests of the 'rounding' module, 'round_array' has to return
+    the same values as 'round_step' for each value.
+"""
+
+import numpy as np
+import pytest
+
+from backpyf_connector.rounding import round_step, round_array, format_step
+
+STEPS = (0.00001, 0.001, 0.01, 0.1, 0.25, 0.5, 1, 10)
+MODES = ('down', 'up', 'nearest')
+
+def values(step:float, size:int = 3000, seed:int = 0) -> np.ndarray:
+    """
+    Values
+
+    Returns positive and negative values with several decimals, 
+        multiples of 'step' and midpoints of the grid.
+    """
+
+    rng = np.random.default_rng(seed)
+    grid = rng.integers(-10**6, 10**6, size) * step
+
+    return np.concatenate([
+        [round(i, n) for i, n in zip(rng.uniform(-1000, 1000, size),
+                                     rng.integers(0, 7, size).tolist())],
+        rng.uniform(-5, 5, size),
+        grid,
+        grid + step/2,
+        [0.0, -0.0, step, -step, step/2, -step/2],
+    ])
+
+@pytest.mark.parametrize('mode', MODES)
+@pytest.mark.parametrize('step', STEPS)
+def test_array_matches_scalar(step, mode):
+    data = values(step)
+    result = round_array(data, step, mode)
+
+    expected = np.array([round_step(i, step, mode) for i in data])
+    assert np.array_equal(result, expected)
+
+@pytest.mark.parametrize('step', STEPS)
+def test_bounds(step):
+    data = values(step, seed=1)
+    down = round_array(data, step, 'down')
+    up = round_array(data, step, 'up')
+    nearest = round_array(data, step, 'nearest')
+
+    assert np.all(down <= data) and np.all(up >= data)
+    assert np.all((nearest == down) | (nearest == up))
+
+@pytest.mark.parametrize('value, step, mode, expected', [
+    (-30.15, 0.1, 'nearest', -30.2),
+    (30.15, 0.1, 'nearest', 30.2),
+    (-0.3, 0.1, 'down', -0.3),
+    (0.1+0.2, 0.1, 'down', 0.3),
+    (-1.25, 0.5, 'up', -1.0),
+])
+def test_cases(value, step, mode, expected):
+    assert round_step(value, step, mode) == expected
+    assert round_array(np.array([value]), step, mode)[0] == expected
+
+def test_format():
+    assert format_step(round_step(0.00001, 0.00001), 0.00001) == '0.00001'
+    assert format_step(round_step(-30.15, 0.1, 'nearest'), 0.1) == '-30.2'